@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from frame_table import FrameTable
+
+
+# 저장 형식이나 저장되는 값의 계산 방식이 바뀌면 올려서 이전 캐시를 무효화
+CACHE_FORMAT_VERSION = 5
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'VideoFrameExtractor'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# 부분 해시에 사용할 파일 앞/뒤 구간 크기
+PARTIAL_HASH_BYTES = 1024 * 1024
+
+
+def partial_content_hash(video_path, block_size=PARTIAL_HASH_BYTES):
+    """파일 앞/뒤 일부만 읽어서 만든 내용 해시"""
+    digest = hashlib.sha1()
+    size = os.path.getsize(video_path)
+
+    with open(video_path, 'rb') as f:
+        digest.update(f.read(block_size))
+        if size > block_size * 2:
+            f.seek(-block_size, os.SEEK_END)
+            digest.update(f.read(block_size))
+
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """analyze_frame_quality 결과를 디스크에 보관하는 LRU 캐시
+
+    키: 절대 경로 + 파일 크기 + 수정 시각 (+ 선택적으로 부분 내용 해시)
+    값: FrameTable 의 열(column) 배열을 묶은 npz 파일
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, use_content_hash=False):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.use_content_hash = use_content_hash
+        self.index_path = self.cache_dir / 'index.json'
+
+    def make_key(self, video_path, variant=''):
+        path = Path(video_path).resolve()
+        stat = path.stat()
+
+        parts = [CACHE_FORMAT_VERSION, str(path), stat.st_size, stat.st_mtime_ns, variant]
+        if self.use_content_hash:
+            parts.append(partial_content_hash(path))
+
+        return hashlib.sha1(json.dumps(parts).encode('utf-8')).hexdigest()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def get(self, video_path, variant=''):
+        """캐시된 FrameTable 반환, 없으면 None"""
+        try:
+            key = self.make_key(video_path, variant)
+        except OSError:
+            return None
+
+        index = self._load_index()
+        entry = index.get(key)
+        if entry is None:
+            return None
+
+        try:
+            with np.load(self.cache_dir / entry['file']) as data:
+                result = FrameTable.from_arrays(data)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARN] 캐시 읽기 실패, 항목 삭제: {e}")
+            self._remove_entry(index, key)
+            self._save_index(index)
+            return None
+
+        entry['last_access'] = time.time()
+        self._save_index(index)
+        return result
+
+    def put(self, video_path, frame_table, variant=''):
+        try:
+            key = self.make_key(video_path, variant)
+        except OSError:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        file_name = f'{key}.npz'
+        tmp_path = self.cache_dir / f'{key}.tmp.npz'
+
+        np.savez_compressed(tmp_path, **frame_table.to_arrays())
+        os.replace(tmp_path, self.cache_dir / file_name)
+
+        index = self._load_index()
+        index[key] = {
+            'file': file_name,
+            'source': str(Path(video_path).resolve()),
+            'bytes': (self.cache_dir / file_name).stat().st_size,
+            'last_access': time.time()
+        }
+        self._evict(index)
+        self._save_index(index)
+
+    def invalidate(self, video_path):
+        """해당 비디오의 모든 캐시 항목 삭제 (파일이 바뀌었는지와 무관)"""
+        source = str(Path(video_path).resolve())
+        index = self._load_index()
+
+        keys = [key for key, entry in index.items() if entry.get('source') == source]
+        for key in keys:
+            self._remove_entry(index, key)
+
+        self._save_index(index)
+        return len(keys)
+
+    def clear(self):
+        index = self._load_index()
+        for key in list(index):
+            self._remove_entry(index, key)
+        self._save_index(index)
+
+    def _remove_entry(self, index, key):
+        entry = index.pop(key, None)
+        if entry is not None:
+            try:
+                (self.cache_dir / entry['file']).unlink()
+            except OSError:
+                pass
+
+    def _evict(self, index):
+        """총 용량이 max_bytes 이하가 될 때까지 오래 안 쓴 항목부터 삭제"""
+        total = sum(entry['bytes'] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= index[key]['bytes']
+            self._remove_entry(index, key)
@@ -0,0 +1,745 @@
+import functools
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from frame_table import FrameTable, top_k_indices
+from luma_decoder import analysis_size, iter_luma_frames
+from metrics import DEFAULT_METRICS, METRICS, MetricAccumulator, histogram_distance
+from probe import ProbeCancelled, probe_frames, probe_packets, probe_start_time
+from selection import frames_for_seconds, triage_candidates
+from shared_columns import SharedColumns
+from tracing import TRACER, Tracer, span, traced
+from worker_pool import WorkerPool, available_cpu_count
+
+
+# 선명도 분석 대상 프레임 타입 ('?' 는 빠른 분석에서 타입을 모르는 프레임)
+ANALYZABLE_TYPES = ('I', 'P', 'B', '?')
+
+# 작업 단위(GOP 묶음)의 최소 프레임 수
+MIN_UNIT_FRAMES = 30
+# 작업 스케줄링이 고르게 되도록 프로세스당 만들 작업 단위 수
+UNITS_PER_PROCESS = 8
+# 분석 취소 요청을 확인하는 간격 (초)
+CANCEL_POLL_INTERVAL = 0.2
+# 작업 프로세스가 죽었을 때 풀을 다시 시작해서 남은 작업 단위를 재시도하는 횟수
+MAX_POOL_RESTARTS = 2
+
+# 점진적 분석 1단계: 키프레임이 이보다 적으면 고른 간격의 프레임을 더해서 표본 수를 맞춤
+COARSE_MIN_SAMPLES = 300
+# 점진적 분석 2단계: 주변을 자세히 분석할 1단계 상위 표본 비율과 최대 개수
+REFINE_FRACTION = 0.05
+REFINE_MAX_SAMPLES = 200
+# 점진적 분석 2단계: 상위 표본 앞뒤로 분석할 범위 (초)
+REFINE_RADIUS_SECONDS = 1.0
+
+# 비트스트림 선별 분석: 패킷 정보 점수 상위 이 비율만 디코딩 (최소 TRIAGE_MIN_FRAMES 개)
+TRIAGE_FRACTION = 0.03
+TRIAGE_MIN_FRAMES = 30
+
+
+@dataclass(frozen=True)
+class AnalysisOptions:
+    """선명도 분석 방식 (작업 프로세스로 그대로 전달됨)
+
+    backend        : 'opencv' (BGR 디코딩 후 흑백 변환) 또는 'ffmpeg' (rawvideo 흑백 파이프)
+    streaming      : opencv 백엔드에서 작업 단위마다 한 번만 탐색하고 순차 디코딩
+    analysis_width : 분석 해상도의 가로 픽셀 수 (0 이면 원본 해상도)
+    low_precision  : CV_64F 대신 CV_16S 라플라시안 사용
+    metrics        : 같은 디코딩 결과로 함께 계산할 지표 (metrics.METRICS 의 이름)
+    trace          : 작업 프로세스의 단계별 시간을 결과와 함께 돌려줌 (tracing.TRACER 가 켜져 있으면 자동 설정)
+    skip_scored    : 공유 메모리에 선명도가 이미 있는 프레임은 stateful 지표만 계산 (점진적 분석 마지막 단계)
+    """
+    backend: str = 'opencv'
+    streaming: bool = True
+    analysis_width: int = 0
+    low_precision: bool = False
+    metrics: tuple = DEFAULT_METRICS
+    trace: bool = False
+    skip_scored: bool = False
+
+    def metric_names(self):
+        """계산할 지표 목록 (선명도는 항상 포함)"""
+        if 'sharpness' in self.metrics:
+            return tuple(self.metrics)
+        return ('sharpness',) + tuple(self.metrics)
+
+    def cache_variant(self):
+        """분석 결과가 달라지는 설정을 캐시 키에 넣을 문자열 (기본 설정이면 빈 문자열)"""
+        parts = []
+        if self.backend != 'opencv' or self.analysis_width != 0 or self.low_precision:
+            precision = 's16' if self.low_precision else 'f64'
+            parts.append(f"{self.backend}-w{self.analysis_width}-{precision}")
+        if self.metric_names() != DEFAULT_METRICS:
+            parts.append('+'.join(self.metric_names()))
+        return '-'.join(parts)
+
+
+def cache_variant(probe_mode, options):
+    """프레임 정보 분석 방식 + 선명도 분석 방식별로 캐시를 따로 보관하기 위한 키"""
+    variant = options.cache_variant()
+    return f"{probe_mode}-{variant}" if variant else probe_mode
+
+
+def build_gop_work_units(target_indices, key_frame, num_processes):
+    """키프레임 경계에 맞춰 분석 대상 프레임을 작은 작업 단위로 분할"""
+    targets = np.asarray(target_indices, dtype=np.int64)
+    if len(targets) == 0:
+        return []
+
+    # 프로세스 수에 비해 작업 단위가 너무 적지 않도록 최소 크기 조절
+    min_unit = max(1, min(MIN_UNIT_FRAMES,
+                          len(targets) // (num_processes * UNITS_PER_PROCESS)))
+
+    # 키프레임에서만 자르므로 각 단위는 GOP 시작점에서 디코딩을 시작함
+    bounds = [0]
+    for pos in np.flatnonzero(key_frame[targets]).tolist():
+        if pos - bounds[-1] >= min_unit:
+            bounds.append(pos)
+    bounds.append(len(targets))
+
+    # 키프레임 정보가 없으면(첫 프레임만 키프레임 등) 균등 분할로 대체
+    if len(bounds) == 2 and num_processes > 1:
+        unit_size = max(1, -(-len(targets) // (num_processes * UNITS_PER_PROCESS)))
+        bounds = list(range(0, len(targets), unit_size)) + [len(targets)]
+
+    return [targets[start:end].tolist() for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+
+def _analysis_gray(frame, options):
+    """BGR 프레임을 흑백으로 바꾸고 분석 해상도로 축소"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+    height, width = gray.shape
+    size = analysis_size(width, height, options.analysis_width)
+    if size != (width, height):
+        gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+    return gray
+
+
+def _chunk_worker(func):
+    """작업 함수 func(args, accumulator, tracer) 의 공통 처리 (별도 프로세스)
+
+    args 는 (비디오 경로, 분석할 프레임 번호 목록, AnalysisOptions, 공유 메모리 정보, ...).
+    공유 메모리 정보 (SharedColumns.spec) 가 있으면 지표를 그 배열에 바로 쓰고 결과에는
+    분석한 프레임 수와 경계 정보만 넣음, 없으면 열 이름 -> 배열 (MetricAccumulator.result 참고).
+    작업 단위 전체를 'chunk' 구간으로 기록하고, 켜져 있으면 기록을 결과의 'trace' 에 붙임
+    """
+    @functools.wraps(func)
+    def wrapper(args):
+        chunk_indices, options, output_spec = args[1], args[2], args[3]
+        tracer = Tracer(enabled=options.trace)
+        output = SharedColumns.attach(output_spec) if output_spec is not None else None
+        scored = output.arrays['sharpness'] if options.skip_scored and output is not None else None
+
+        try:
+            accumulator = MetricAccumulator(options.metric_names(), options.low_precision,
+                                            tracer=tracer, output=output, scored=scored)
+            first = chunk_indices[0] if chunk_indices else -1
+            with tracer.span('chunk', 'worker', worker=func.__name__, first=first, frames=len(chunk_indices)):
+                if chunk_indices:
+                    func(args, accumulator, tracer)
+                result = accumulator.result()
+        finally:
+            if output is not None:
+                output.close()
+
+        if tracer.enabled:
+            result['trace'] = tracer.export()
+        return result
+    return wrapper
+
+
+@_chunk_worker
+def analyze_sharpness_chunk(args, accumulator, tracer):
+    """청크 단위로 프레임마다 탐색해서 선명도 등 지표 분석"""
+    video_path, chunk_indices, options = args[:3]
+
+    with tracer.span('open', 'worker'):
+        cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"비디오를 열 수 없음: {video_path}")
+
+    t = time.perf_counter()
+    for idx in chunk_indices:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+        t = tracer.lap('seek', t)
+        ret, frame = cap.read()
+        t = tracer.lap('decode', t)
+
+        if ret and frame is not None:
+            gray = _analysis_gray(frame, options)
+            tracer.lap('convert', t)
+            accumulator.add(idx, gray)
+            t = time.perf_counter()
+
+    cap.release()
+
+
+@_chunk_worker
+def analyze_sharpness_chunk_streaming(args, accumulator, tracer):
+    """연속 구간을 한 번만 탐색 후 순차 디코딩으로 지표 분석"""
+    video_path, chunk_indices, options = args[:3]
+
+    with tracer.span('open', 'worker'):
+        cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"비디오를 열 수 없음: {video_path}")
+
+    wanted = set(chunk_indices)
+    start = min(chunk_indices)
+    end = max(chunk_indices)
+
+    # 구간 시작점으로 한 번만 탐색, 이후에는 앞으로만 디코딩
+    with tracer.span('seek', 'worker', frame=start):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    t = time.perf_counter()
+    for idx in range(start, end + 1):
+        if not cap.grab():
+            break
+        t = tracer.lap('decode', t)
+
+        # 분석 대상이 아닌 프레임은 BGR 변환(retrieve) 없이 건너뜀
+        if idx not in wanted:
+            continue
+
+        ret, frame = cap.retrieve()
+        t = tracer.lap('retrieve', t)
+
+        if ret and frame is not None:
+            gray = _analysis_gray(frame, options)
+            tracer.lap('convert', t)
+            accumulator.add(idx, gray)
+            t = time.perf_counter()
+
+    cap.release()
+
+
+@_chunk_worker
+def analyze_sharpness_chunk_ffmpeg(args, accumulator, tracer):
+    """ffmpeg 흑백 파이프로 연속 구간을 디코딩해서 지표 분석
+
+    BGR 변환 없이 Y 평면만, 필요하면 ffmpeg 안에서 분석 해상도로 줄여서 받음
+    """
+    video_path, chunk_indices, options, _, start_time, source_size = args
+
+    wanted = set(chunk_indices)
+    start = min(chunk_indices)
+    end = max(chunk_indices)
+
+    size = analysis_size(source_size[0], source_size[1], options.analysis_width)
+
+    frames = iter_luma_frames(video_path, start_time, end - start + 1, source_size, size)
+    t = time.perf_counter()
+    for idx, gray in enumerate(frames, start):
+        # ffmpeg 가 디코딩/축소한 프레임을 파이프에서 받기까지 기다린 시간
+        tracer.lap('pipe_read', t)
+        # 파이프 버퍼는 다음 프레임에 덮어써지므로 배치 버퍼로 복사됨
+        if idx in wanted:
+            accumulator.add(idx, gray)
+        t = time.perf_counter()
+
+
+def _unit_start_times(frame_table, units, fps, container_start):
+    """작업 단위 첫 프레임의 ffmpeg -ss 탐색 시각 (컨테이너 시작 시각 기준 초)
+
+    pts 는 절대 시각이므로 container_start (probe_start_time) 를 빼서 -ss 기준에 맞춤.
+    정확한 탐색은 -ss 보다 앞선 프레임을 버리므로 pts 반올림 오차로 첫 프레임이 빠지지 않게 반 프레임 앞을 지정.
+    pts 가 없으면 fps 로 추정 (첫 프레임 기준)
+    """
+    pts = frame_table.pts
+    half_frame = 0.5 / fps if fps > 0 else 0.001
+
+    start_times = []
+    for unit in units:
+        t = pts[unit[0]] - container_start
+        if np.isnan(t):
+            t = unit[0] / fps if fps > 0 else 0.0
+        t = t - half_frame if unit[0] > 0 else 0.0
+        start_times.append(max(0.0, float(t)))
+    return start_times
+
+
+class AnalysisCancelled(Exception):
+    """분석이 사용자 요청으로 취소됨"""
+
+
+class AnalysisFailed(Exception):
+    """작업 단위 실패 등으로 분석이 끝까지 완료되지 않음 (지금까지의 결과는 frame_table 에 남아 있음)"""
+
+
+def _check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise AnalysisCancelled()
+
+
+@traced('probe')
+def probe_frame_table(video_path, probe_mode='full', expected_frames=0, on_probe_progress=None,
+                      cancel_event=None):
+    """비디오의 모든 프레임 타입, 크기, QP, 참조여부 분석
+
+    probe_mode='fast' 이면 패킷 정보(크기, 키프레임)만 읽고 디코딩하지 않음.
+    이 경우 키프레임이 아닌 프레임의 타입은 '?' 로 표시됨
+    """
+    def handle_progress(arrays):
+        if on_probe_progress is not None:
+            on_probe_progress(arrays.count)
+
+    # ffprobe 출력을 파이프에서 한 줄씩 읽어 배열에 채움 (취소되면 다음 줄에서 ffprobe 프로세스 종료)
+    probe_func = probe_packets if probe_mode == 'fast' else probe_frames
+    try:
+        with span('ffprobe', mode=probe_mode):
+            probe = probe_func(video_path, expected_frames=expected_frames, on_progress=handle_progress,
+                               cancel_event=cancel_event)
+    except ProbeCancelled:
+        raise AnalysisCancelled() from None
+
+    with span('frame_table', frames=probe.count):
+        frame_table = FrameTable.from_probe(probe)
+    has_quality = frame_table.has_quality()
+
+    counts = frame_table.type_counts()
+    i_count, p_count, b_count = counts['I'], counts['P'], counts['B']
+    ref_count = int(frame_table.is_reference.sum())
+
+    print(f"[INFO] 프레임 분석 완료: I={i_count}, P={p_count}, B={b_count}, 참조={ref_count}")
+
+    if probe_mode == 'fast':
+        print(f"[INFO] 빠른 분석 (패킷 기준): 키프레임 외 {len(frame_table) - i_count}개 프레임 타입 미상")
+
+    if has_quality:
+        print(f"[INFO] QP 값 지원됨")
+    else:
+        print(f"[INFO] QP 값 미지원")
+
+    # 타입별 평균 크기 기준 추가 참조 프레임 탐지
+    avg_sizes = frame_table.avg_sizes
+    with span('reference_heuristic'):
+        frame_table.apply_reference_heuristic()
+
+    ref_count = int(frame_table.is_reference.sum())
+    print(f"[INFO] 크기 분석 후 참조 프레임: {ref_count}개")
+
+    if avg_sizes:
+        print(f"[INFO] 평균 크기 - I: {avg_sizes.get('I', 0):.0f}B, "
+              f"P: {avg_sizes.get('P', 0):.0f}B, "
+              f"B: {avg_sizes.get('B', 0):.0f}B")
+
+    return frame_table
+
+
+class _BoundaryStitcher:
+    """작업 단위 경계 프레임의 scene_diff 를 이웃 단위의 마지막/첫 히스토그램으로 채움
+
+    각 작업 단위의 첫 프레임은 직전 프레임이 다른 프로세스에서 디코딩되므로 워커 안에서는
+    비교할 수 없음. 작업 단위가 끝나는 순서는 제각각이라 이웃 둘이 모두 도착했을 때 계산
+    """
+
+    def __init__(self, frame_table, units):
+        self.frame_table = frame_table
+        self.unit_starts = np.array([unit[0] for unit in units], dtype=np.int64)
+        self.boundaries = [None] * len(units)
+
+    def add(self, boundary):
+        if boundary is None:
+            return
+
+        pos = int(np.searchsorted(self.unit_starts, boundary['first_index'], side='right')) - 1
+        self.boundaries[pos] = boundary
+
+        if pos > 0:
+            self._stitch(pos - 1, pos)
+        if pos + 1 < len(self.boundaries):
+            self._stitch(pos, pos + 1)
+
+    def _stitch(self, left, right):
+        left_boundary, right_boundary = self.boundaries[left], self.boundaries[right]
+        if left_boundary is None or right_boundary is None:
+            return
+
+        left_state = left_boundary['states'].get('scene')
+        right_state = right_boundary['states'].get('scene')
+        scene_diff = self.frame_table.metrics.get('scene_diff')
+        if not left_state or not right_state or scene_diff is None:
+            return
+
+        scene_diff[right_boundary['first_index']] = histogram_distance(left_state['last_hist'],
+                                                                       right_state['first_hist'])
+
+
+def _share_result_columns(frame_table, options):
+    """분석 결과 열을 공유 메모리로 옮기고 frame_table 이 그 배열을 쓰도록 함 (실패하면 None)
+
+    작업 프로세스가 값을 바로 쓰므로 분석 중에도 frame_table 로 지금까지의 결과를 읽을 수 있음
+    """
+    dtypes = {'sharpness': np.float64}
+    for name in options.metric_names():
+        metric = METRICS[name]
+        for column in metric.columns:
+            dtypes[column] = metric.dtype
+
+    try:
+        shared = SharedColumns.create(len(frame_table), dtypes)
+    except OSError as e:
+        print(f"[WARN] 공유 메모리를 만들 수 없어 결과를 프로세스 간 복사로 전달: {e}")
+        return None
+
+    # 이미 있는 값 (다른 지표로 분석했던 결과 등) 은 그대로 유지
+    for name, array in shared.arrays.items():
+        existing = frame_table.sharpness if name == 'sharpness' else frame_table.metrics.get(name)
+        if existing is not None and existing.dtype == array.dtype:
+            array[:] = existing
+    frame_table.use_columns(shared.arrays)
+    return shared
+
+
+def _wait_any(futures, cancel_event):
+    """futures 중 하나 이상 끝날 때까지 기다려서 끝난 것들 반환 (취소 요청을 짧은 간격으로 확인)"""
+    while True:
+        try:
+            _check_cancelled(cancel_event)
+        except AnalysisCancelled:
+            # 아직 시작하지 않은 작업 단위는 버리고, 실행 중인 것은 풀에서 알아서 끝남
+            for future in futures:
+                future.cancel()
+            raise
+        done, _ = wait(futures, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+        if done:
+            return done
+
+
+def _collect_results(pool, worker, work_units, frame_table, total, on_progress, cancel_event):
+    """작업 단위를 pool (WorkerPool) 에 넣고 끝나는 순서대로 frame_table 에 기록, 분석한 프레임 수 반환
+
+    작업 프로세스가 죽으면 (BrokenProcessPool) 그 전에 끝난 작업 단위 결과는 기록하고, 풀을 다시 시작해서
+    끝나지 않은 작업 단위만 다시 넣음. 작업 단위가 실패하거나 재시도해도 끝나지 않으면 AnalysisFailed
+    """
+    analyzed = 0
+    stitcher = _BoundaryStitcher(frame_table, [unit[1] for unit in work_units])
+    remaining = list(work_units)
+
+    def record(future):
+        nonlocal analyzed
+        analyzed += _record_chunk(frame_table, stitcher, future.result())
+        if on_progress is not None:
+            on_progress(analyzed, total)
+
+    for attempt in range(MAX_POOL_RESTARTS + 1):
+        # future -> remaining 안의 위치
+        futures = {}
+        finished = set()
+        try:
+            for pos, unit in enumerate(remaining):
+                futures[pool.submit(worker, unit)] = pos
+
+            while len(finished) < len(remaining):
+                pending = [future for future, pos in futures.items() if pos not in finished]
+                for future in _wait_any(pending, cancel_event):
+                    # 결과를 먼저 받아서 (BrokenProcessPool 이면 여기서 예외) 실패한 단위는 끝난 것으로 치지 않음
+                    future.result()
+                    finished.add(futures[future])
+                    record(future)
+            return analyzed
+
+        except BrokenProcessPool:
+            # 풀이 깨지기 전에 끝난 작업 단위는 결과를 기록하고 재시도 대상에서 뺌 (같은 결과를 두 번 합치지 않도록)
+            for future, pos in futures.items():
+                if pos not in finished and future.done() and not future.cancelled() and future.exception() is None:
+                    finished.add(pos)
+                    record(future)
+
+            remaining = [unit for pos, unit in enumerate(remaining) if pos not in finished]
+            pool.restart()
+            if attempt < MAX_POOL_RESTARTS:
+                print(f"[WARN] 작업 프로세스가 비정상 종료됨, 끝나지 않은 작업 단위 {len(remaining)}개 재시도 "
+                      f"({attempt + 1}/{MAX_POOL_RESTARTS})")
+
+        except AnalysisCancelled:
+            raise
+
+        except Exception as e:
+            for future in futures:
+                future.cancel()
+            raise AnalysisFailed(f"작업 단위 분석 실패: {e}") from e
+
+    raise AnalysisFailed(f"작업 프로세스가 계속 비정상 종료되어 작업 단위 {len(remaining)}개를 분석하지 못함")
+
+
+def _record_chunk(frame_table, stitcher, chunk_result):
+    """작업 단위 결과 하나를 frame_table 에 반영하고 분석한 프레임 수 반환"""
+    # 워커가 잰 단계별 시간은 같은 타임라인에 합침
+    TRACER.merge(chunk_result.pop('trace', None))
+
+    if 'frame_index' in chunk_result:
+        # 공유 메모리를 못 쓰는 경우: 프레임 인덱스 위치에 바로 기록하므로 병합/정렬 불필요
+        with span('set_metrics', frames=len(chunk_result['frame_index'])):
+            frame_table.set_metrics(chunk_result['frame_index'], chunk_result)
+        count = len(chunk_result['frame_index'])
+    else:
+        # 작업 프로세스가 공유 메모리 배열에 이미 기록함
+        frame_table.metrics_changed()
+        count = chunk_result['frame_count']
+
+    stitcher.add(chunk_result.get('boundary'))
+    return count
+
+
+@traced('analyze_sharpness')
+def analyze_sharpness_parallel(video_path, frame_table, options=None, on_progress=None, cancel_event=None,
+                               pool=None, units=None):
+    """멀티프로세싱으로 선명도 분석, 결과는 frame_table.sharpness (그 외 지표는 frame_table.metrics) 에 기록
+
+    분석한 프레임 수를 반환. 작업 단위가 실패했거나 디코딩하지 못한 프레임이 있으면 AnalysisFailed
+    (그때까지의 결과는 frame_table 에 남아 있지만 완전한 결과가 아니므로 캐시하면 안 됨)
+
+    options (AnalysisOptions) 로 디코딩 백엔드, 분석 해상도/정밀도, 함께 계산할 지표를 선택.
+    on_progress(analyzed, total) 는 작업 단위가 끝날 때마다 호출됨.
+    pool (WorkerPool) 을 넘기면 그 풀을 재사용하고 (GUI, 여러 비디오 일괄 분석), 없으면 새로 만들고 끝나면 종료.
+    units (프레임 번호 목록의 목록) 를 주면 분석 가능한 모든 프레임 대신 그 작업 단위만 분석
+    """
+    if options is None:
+        options = AnalysisOptions()
+    if TRACER.enabled and not options.trace:
+        options = replace(options, trace=True)
+
+    # CPU 코어 수 (affinity 기준, 상한 없음)
+    num_processes = available_cpu_count()
+
+    if units is None:
+        # I, P, B (빠른 분석이면 타입 미상 포함) 프레임만 필터링
+        target_indices = frame_table.indices_of_types(ANALYZABLE_TYPES)
+        # GOP 경계 기준 작업 단위 나누기
+        units = build_gop_work_units(target_indices, frame_table.key_frame, num_processes)
+    else:
+        units = [list(unit) for unit in units if len(unit)]
+        target_indices = [idx for unit in units for idx in unit]
+
+    if len(target_indices) == 0:
+        print("[WARN] 분석할 프레임이 없음")
+        return 0
+
+    print(f"[INFO] {len(target_indices)}개 프레임 병렬 분석 중...")
+
+    abs_path = str(Path(video_path).resolve())
+
+    shared = _share_result_columns(frame_table, options)
+    output_spec = shared.spec() if shared is not None else None
+
+    if options.backend == 'ffmpeg':
+        cap = cv2.VideoCapture(abs_path)
+        source_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        cap.release()
+
+        start_times = _unit_start_times(frame_table, units, fps, probe_start_time(abs_path))
+        work_units = [(abs_path, unit, options, output_spec, start_time, source_size)
+                      for unit, start_time in zip(units, start_times)]
+        worker = analyze_sharpness_chunk_ffmpeg
+        mode = 'ffmpeg 흑백 파이프'
+    else:
+        work_units = [(abs_path, unit, options, output_spec) for unit in units]
+        worker = analyze_sharpness_chunk_streaming if options.streaming else analyze_sharpness_chunk
+        mode = '순차 디코딩' if options.streaming else '프레임별 탐색'
+
+    if options.analysis_width:
+        mode += f", 가로 {options.analysis_width}px"
+    if options.low_precision:
+        mode += ", CV_16S"
+
+    if pool is None:
+        num_processes = min(num_processes, len(work_units))
+
+    print(f"[INFO] {len(work_units)}개 작업 단위로 분할, 프로세스 {num_processes}개 ({mode})")
+    print(f"[INFO] 지표: {', '.join(options.metric_names())}")
+
+    # 병렬 처리 (끝난 프로세스가 남은 작업 단위를 바로 가져감)
+    try:
+        if pool is not None:
+            analyzed = _collect_results(pool, worker, work_units, frame_table, len(target_indices),
+                                        on_progress, cancel_event)
+        else:
+            # 이번 분석에만 쓰는 풀 (with 블록을 벗어나면 대기 중인 작업은 취소하고 종료)
+            with WorkerPool(num_processes) as own_pool:
+                analyzed = _collect_results(own_pool, worker, work_units, frame_table, len(target_indices),
+                                            on_progress, cancel_event)
+
+        print(f"[INFO] 병렬 분석 완료: {analyzed}개 프레임")
+
+        with span('scene_cuts'):
+            frame_table.detect_scene_cuts()
+        if 'scene_diff' in frame_table.metrics:
+            print(f"[INFO] 장면 {len(frame_table.scene_cuts)}개 검출")
+
+        missing = len(target_indices) - analyzed
+        if missing > 0:
+            raise AnalysisFailed(f"{len(target_indices)}개 중 {missing}개 프레임을 디코딩하지 못함")
+
+        return analyzed
+
+    except (AnalysisCancelled, AnalysisFailed):
+        raise
+
+    except Exception as e:
+        print(f"[ERROR] 병렬 처리 실패: {e}")
+        import traceback
+        traceback.print_exc()
+        raise AnalysisFailed(f"병렬 처리 실패: {e}") from e
+
+    finally:
+        if shared is not None:
+            # 공유 메모리를 지우기 전에 일반 배열로 옮김 (취소/실패해도 지금까지의 결과는 유지)
+            frame_table.use_columns(shared.copy_arrays())
+            shared.close()
+
+
+def coarse_sample_indices(frame_table, min_samples=COARSE_MIN_SAMPLES):
+    """점진적 분석 1단계 표본: 키프레임 (min_samples 보다 적으면 고른 간격의 프레임 추가)"""
+    targets = frame_table.indices_of_types(ANALYZABLE_TYPES)
+    samples = targets[frame_table.key_frame[targets]]
+    if len(samples) < min_samples and len(targets) > len(samples):
+        step = max(1, len(targets) // min_samples)
+        samples = np.union1d(samples, targets[::step])
+    return samples
+
+
+def refine_ranges(frame_table, samples, radius, fraction=REFINE_FRACTION, max_samples=REFINE_MAX_SAMPLES):
+    """samples 중 선명도 상위 프레임의 앞뒤 radius 프레임 구간들 ([시작, 끝) 목록, 겹치면 합침)"""
+    samples = samples[~np.isnan(frame_table.sharpness[samples])]
+    if len(samples) == 0:
+        return []
+
+    k = min(max_samples, max(1, math.ceil(len(samples) * fraction)))
+    best = np.sort(samples[top_k_indices(frame_table.sharpness[samples], k)])
+    starts = np.maximum(best - radius, 0)
+    ends = np.minimum(best + radius + 1, len(frame_table))
+
+    ranges = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+    return [tuple(r) for r in ranges]
+
+
+def _without_stateful_metrics(options, **changes):
+    """떨어진 프레임끼리 비교하게 되는 stateful 지표 (장면 전환) 를 뺀 분석 방식"""
+    metrics = tuple(name for name in options.metric_names() if not METRICS[name].stateful)
+    return replace(options, metrics=metrics, **changes)
+
+
+@traced('analyze_progressive')
+def analyze_sharpness_progressive(video_path, frame_table, options=None, on_progress=None, on_level=None,
+                                  cancel_event=None, pool=None):
+    """긴 비디오용 점진적 분석: 성긴 표본 -> 상위 표본 주변 -> 전체 순서로 나눠서 분석
+
+    1단계  키프레임 위주의 표본 (coarse_sample_indices) 을 프레임별 탐색으로 분석
+    2단계  1단계 상위 표본의 앞뒤 REFINE_RADIUS_SECONDS 초를 순차 디코딩으로 분석
+    3단계  앞 단계에서 점수를 매기지 않은 프레임만 분석. stateful 지표 (장면 전환) 가 있으면 이웃
+           프레임이 모두 필요하므로 전체 구간을 디코딩하되, 이미 점수가 있는 프레임은 stateful 지표만
+           계산 (AnalysisOptions.skip_scored)
+
+    1, 2단계는 stateful 지표를 빼고 계산. 단계마다 결과가 frame_table 에 반영되고,
+    on_level(level, level_count, name) 은 각 단계를 시작할 때 호출됨 (level 은 1부터)
+    """
+    if options is None:
+        options = AnalysisOptions()
+    if pool is None:
+        # 세 단계가 같은 풀을 쓰도록 한 번만 만듦
+        with WorkerPool() as own_pool:
+            return analyze_sharpness_progressive(video_path, frame_table, options, on_progress, on_level,
+                                                 cancel_event, own_pool)
+
+    levels = ('키프레임 표본', '상위 표본 주변', '전체 프레임')
+
+    def start_level(level):
+        _check_cancelled(cancel_event)
+        print(f"[INFO] 점진적 분석 {level}/{len(levels)}단계: {levels[level - 1]}")
+        if on_level is not None:
+            on_level(level, len(levels), levels[level - 1])
+
+    # 1단계: 흩어진 프레임이므로 구간 순차 디코딩 대신 프레임마다 탐색 (키프레임은 탐색 후 바로 디코딩됨)
+    start_level(1)
+    samples = coarse_sample_indices(frame_table)
+    unit_count = max(1, min(len(samples), available_cpu_count() * UNITS_PER_PROCESS))
+    coarse_units = [unit.tolist() for unit in np.array_split(samples, unit_count)]
+    analyze_sharpness_parallel(video_path, frame_table,
+                               _without_stateful_metrics(options, backend='opencv', streaming=False),
+                               on_progress, cancel_event, pool, units=coarse_units)
+
+    # 2단계: 상위 표본 주변 구간마다 하나의 작업 단위 (구간 안은 순차 디코딩)
+    start_level(2)
+    radius = frames_for_seconds(frame_table, REFINE_RADIUS_SECONDS)
+    targets = frame_table.indices_of_types(ANALYZABLE_TYPES)
+    refine_units = []
+    for start, end in refine_ranges(frame_table, samples, radius):
+        lo, hi = np.searchsorted(targets, [start, end])
+        refine_units.append(targets[lo:hi].tolist())
+    analyze_sharpness_parallel(video_path, frame_table, _without_stateful_metrics(options),
+                               on_progress, cancel_event, pool, units=refine_units)
+
+    # 3단계: 앞 단계에서 점수를 매기지 않은 나머지
+    start_level(3)
+    if options.backend != 'opencv':
+        # 1단계 표본은 OpenCV 로 디코딩했으므로 다른 백엔드의 값과 섞이지 않도록 다시 분석
+        frame_table.sharpness[samples] = np.nan
+
+    if any(METRICS[name].stateful for name in options.metric_names()):
+        return analyze_sharpness_parallel(video_path, frame_table, replace(options, skip_scored=True),
+                                          on_progress, cancel_event, pool)
+
+    remaining = targets[np.isnan(frame_table.sharpness[targets])]
+    units = build_gop_work_units(remaining, frame_table.key_frame, available_cpu_count())
+    return analyze_sharpness_parallel(video_path, frame_table, options, on_progress, cancel_event, pool, units=units)
+
+
+@traced('analyze_triage')
+def analyze_sharpness_triage(video_path, frame_table, options=None, fraction=TRIAGE_FRACTION, on_progress=None,
+                             cancel_event=None, pool=None):
+    """패킷 크기/QP/키프레임 거리 점수 (selection.bitstream_scores) 상위 fraction 비율 프레임만 선명도 분석
+
+    분석한 프레임 수를 반환 (후보가 없으면 0). 나머지 프레임은 디코딩하지 않으므로 선명도가 NaN 으로 남음.
+    후보가 흩어져 있어서 프레임마다 탐색하고, 떨어진 프레임끼리 비교하게 되는 stateful 지표 (장면 전환) 는
+    계산하지 않음
+    """
+    if options is None:
+        options = AnalysisOptions()
+
+    targets = frame_table.indices_of_types(ANALYZABLE_TYPES)
+    candidates = triage_candidates(frame_table, fraction, targets, TRIAGE_MIN_FRAMES)
+    print(f"[INFO] 비트스트림 선별: {len(targets)}개 중 {len(candidates)}개 프레임만 분석")
+    if len(candidates) == 0:
+        return 0
+
+    unit_count = min(len(candidates), available_cpu_count() * UNITS_PER_PROCESS)
+    units = [unit.tolist() for unit in np.array_split(candidates, unit_count)]
+    return analyze_sharpness_parallel(video_path, frame_table,
+                                      _without_stateful_metrics(options, backend='opencv', streaming=False),
+                                      on_progress, cancel_event, pool, units=units)
+
+
+def analyze_frame_quality(video_path, probe_mode='full', expected_frames=0, options=None, pool=None):
+    """프레임 정보 분석 + 선명도 분석을 한 번에 수행 (동기 호출)"""
+    try:
+        frame_table = probe_frame_table(video_path, probe_mode, expected_frames)
+    except Exception as e:
+        print(f"[ERROR] ffprobe 실패: {e}")
+        return None
+
+    # 선명도 병렬 분석 (frame_table.sharpness 에 기록)
+    print("[INFO] 선명도 병렬 분석 시작...")
+    try:
+        analyze_sharpness_parallel(video_path, frame_table, options, pool=pool)
+    except AnalysisFailed as e:
+        print(f"[ERROR] 선명도 분석 실패: {e}")
+        return None
+
+    return frame_table
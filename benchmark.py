@@ -0,0 +1,423 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from analyzer import (ANALYZABLE_TYPES, AnalysisOptions, analyze_sharpness_chunk_ffmpeg,
+                      analyze_sharpness_chunk_streaming, analyze_sharpness_parallel, available_cpu_count,
+                      probe_frame_table)
+from exporter import EXPORT_PROFILES, export_frames
+from frame_reader import FrameReader
+from frame_table import FrameTable
+from hash_index import group_near_duplicates
+from selection import select_best_frames
+from version import VERSION
+from worker_pool import WorkerPool
+
+
+@dataclass(frozen=True)
+class VideoSpec:
+    """합성 테스트 비디오 설정 (gop 는 키프레임 간격, 프레임 수)"""
+    width: int
+    height: int
+    seconds: int
+    fps: int = 30
+    gop: int = 60
+
+    @property
+    def name(self):
+        return f"{self.width}x{self.height}_{self.seconds}s_{self.fps}fps_gop{self.gop}"
+
+
+# 스위트 이름 -> 합성 비디오 목록
+SUITES = {
+    'quick': [
+        VideoSpec(320, 240, 5, gop=30),
+    ],
+    'default': [
+        VideoSpec(640, 360, 10, gop=30),
+        VideoSpec(640, 360, 10, gop=250),
+        VideoSpec(1280, 720, 10, gop=60),
+        VideoSpec(1920, 1080, 5, gop=60),
+    ],
+    'long': [
+        VideoSpec(1280, 720, 60, gop=60),
+        VideoSpec(1920, 1080, 30, gop=120),
+    ],
+}
+DEFAULT_SUITE = 'quick'
+
+# 항목마다 반복 횟수 (중앙값 사용)
+DEFAULT_REPEATS = 3
+# 기준보다 이 비율 이상 느려지면 성능 저하로 표시
+DEFAULT_TOLERANCE = 0.15
+# 이보다 짧은 차이는 측정 오차로 보고 무시 (초)
+MIN_REGRESSION_SECONDS = 0.005
+# 탐색 지연 측정 횟수 (방향별)
+SEEK_SAMPLES = 40
+# 내보내기 측정에 쓰는 베스트 프레임 수
+EXPORT_FRAMES = 20
+RANDOM_SEED = 1234
+
+
+def make_synthetic_video(spec, path):
+    """spec 대로 합성 비디오 생성 (ffmpeg testsrc2 + libx264, 없으면 cv2.VideoWriter)
+
+    ffmpeg 는 키프레임 간격을 spec.gop 로 고정하고 B 프레임을 넣음.
+    cv2.VideoWriter (mp4v) 는 키프레임 간격을 지정할 수 없으므로 gop 가 맞지 않을 수 있음
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if shutil.which('ffmpeg'):
+        cmd = [
+            'ffmpeg', '-v', 'error', '-nostdin', '-y',
+            '-f', 'lavfi',
+            '-i', f'testsrc2=size={spec.width}x{spec.height}:rate={spec.fps}:duration={spec.seconds}',
+            '-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p',
+            '-g', str(spec.gop), '-keyint_min', str(spec.gop), '-sc_threshold', '0', '-bf', '2',
+            str(path),
+        ]
+        subprocess.run(cmd, check=True)
+        return path
+
+    print("[WARN] ffmpeg 가 없어 cv2.VideoWriter 로 생성 (키프레임 간격 지정 불가)")
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), spec.fps, (spec.width, spec.height))
+    rng = np.random.default_rng(RANDOM_SEED)
+    base = rng.integers(0, 256, (spec.height, spec.width, 3), dtype=np.uint8)
+    try:
+        for i in range(spec.seconds * spec.fps):
+            # 움직이는 무늬 + 프레임 번호 (프레임마다 내용이 달라지도록)
+            frame = np.roll(base, i * 4, axis=1)
+            cv2.putText(frame, str(i), (20, spec.height // 2), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+            writer.write(frame)
+    finally:
+        writer.release()
+    return path
+
+
+def ensure_video(spec, video_dir):
+    """video_dir 에 spec 비디오가 없을 때만 생성 (같은 설정이면 다시 사용)"""
+    path = Path(video_dir) / f"{spec.name}.mp4"
+    if not path.exists():
+        print(f"[INFO] 합성 비디오 생성: {path.name}")
+        make_synthetic_video(spec, path)
+    return path
+
+
+def measure(func, repeats):
+    """func 를 repeats 번 실행한 시간 (초) 목록과 마지막 반환값"""
+    runs = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        runs.append(time.perf_counter() - start)
+    return runs, result
+
+
+def timing_entry(runs, **extra):
+    entry = {'seconds': float(np.median(runs)), 'runs': [round(r, 6) for r in runs]}
+    entry.update(extra)
+    return entry
+
+
+def latency_entry(samples):
+    """탐색 지연 통계 (밀리초), 회귀 비교는 seconds (중앙값) 기준"""
+    samples = np.asarray(samples, dtype=np.float64)
+    return {
+        'seconds': float(np.median(samples)),
+        'p95_ms': float(np.percentile(samples, 95) * 1000),
+        'max_ms': float(samples.max() * 1000),
+        'samples': len(samples),
+    }
+
+
+def _copy_table(frame_table):
+    """분석 결과를 쓸 수 있는 독립된 사본 (to_arrays 는 배열을 공유하므로 복사)"""
+    return FrameTable.from_arrays({name: np.array(values) for name, values in frame_table.to_arrays().items()})
+
+
+def serial_reference(video_path, frame_table, options):
+    """같은 프레임을 한 프로세스에서 처음부터 순차 디코딩해서 분석한 결과 (병렬 결과 검증용)"""
+    reference = _copy_table(frame_table)
+    targets = reference.indices_of_types(ANALYZABLE_TYPES).tolist()
+    abs_path = str(Path(video_path).resolve())
+
+    if options.backend == 'ffmpeg':
+        cap = cv2.VideoCapture(abs_path)
+        source_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        cap.release()
+        result = analyze_sharpness_chunk_ffmpeg((abs_path, targets, options, None, 0.0, source_size))
+    else:
+        result = analyze_sharpness_chunk_streaming((abs_path, targets, options, None))
+
+    reference.set_metrics(result['frame_index'], result)
+    reference.detect_scene_cuts()
+    return reference
+
+
+def compare_tables(parallel, reference):
+    """두 분석 결과에서 값이 다른 열 이름 -> 다른 프레임 수 (NaN 끼리는 같은 값으로 봄)"""
+    mismatches = {}
+    names = ['sharpness'] + sorted(set(parallel.metrics) | set(reference.metrics))
+    for name in names:
+        if name != 'sharpness' and (name not in parallel.metrics or name not in reference.metrics):
+            mismatches[name] = len(parallel)
+            continue
+        a, b = parallel.column(name), reference.column(name)
+        if a.dtype.kind == 'f':
+            differs = ~((a == b) | (np.isnan(a) & np.isnan(b)))
+        else:
+            differs = a != b
+        count = int(differs.sum())
+        if count:
+            mismatches[name] = count
+
+    if not np.array_equal(parallel.scene_cuts, reference.scene_cuts):
+        mismatches['scene_cuts'] = abs(len(parallel.scene_cuts) - len(reference.scene_cuts)) or 1
+    return mismatches
+
+
+def populate_stats(frame_table):
+    """GUI 통계 목록을 채울 때와 같은 계산 (Qt 모델 갱신 제외)"""
+    analyzed = frame_table.analyzed_indices()
+    frame_table.rank('sharpness', analyzed)
+    frame_table.scene_stats()
+    for frame_type in ('I', 'P', 'B'):
+        frame_table.top_k('size', 20, frame_table.indices_of_types((frame_type,)))
+    if frame_table.has_hashes():
+        group_near_duplicates(frame_table.metrics['dhash'], ~np.isnan(frame_table.sharpness))
+
+
+def seek_latencies(video_path, frame_table, rng):
+    """show_frame 이 쓰는 FrameReader 로 방향별 프레임 표시 지연 (초) 측정
+
+    forward  : 한 프레임씩 앞으로 (탐색 없이 다음 프레임만 디코딩)
+    backward : 한 프레임씩 뒤로 (GOP 마다 키프레임 탐색 후 캐시에서 반환)
+    random   : 임의 위치로 이동 (매번 캐시를 비우고 키프레임부터 디코딩)
+    """
+    n = len(frame_table)
+    key_frames = np.flatnonzero(frame_table.key_frame)
+    samples = min(SEEK_SAMPLES, n)
+    latencies = {}
+
+    def timed_reads(frame_numbers, clear_cache=False):
+        reader = FrameReader(video_path, key_frames)
+        times = []
+        try:
+            for frame_number in frame_numbers:
+                if clear_cache:
+                    reader.cache.clear()
+                start = time.perf_counter()
+                reader.read(int(frame_number))
+                times.append(time.perf_counter() - start)
+        finally:
+            reader.release()
+        return times
+
+    middle = n // 2
+    latencies['seek_forward'] = latency_entry(timed_reads(range(middle, min(n, middle + samples))))
+    latencies['seek_backward'] = latency_entry(timed_reads(range(n - 1, max(-1, n - 1 - samples), -1)))
+    latencies['seek_random'] = latency_entry(timed_reads(rng.integers(0, n, samples), clear_cache=True))
+    return latencies
+
+
+def benchmark_video(video_path, args, options, pool):
+    """비디오 하나의 항목별 측정 결과와 병렬/순차 결과 불일치 목록"""
+    results = {}
+    video_path = str(video_path)
+
+    runs, frame_table = measure(lambda: probe_frame_table(video_path, args.probe_mode), args.repeats)
+    results['probe'] = timing_entry(runs, frames=len(frame_table))
+
+    def analyze():
+        table = _copy_table(frame_table)
+        analyze_sharpness_parallel(video_path, table, options, pool=pool)
+        return table
+
+    runs, analyzed = measure(analyze, args.repeats)
+    frames = len(analyzed.analyzed_indices())
+    results['sharpness'] = timing_entry(runs, frames=frames, fps=frames / max(np.median(runs), 1e-9))
+
+    runs, reference = measure(lambda: serial_reference(video_path, frame_table, options), 1)
+    results['sharpness_serial'] = timing_entry(runs, frames=len(reference.analyzed_indices()))
+    mismatches = compare_tables(analyzed, reference)
+
+    runs, _ = measure(lambda: populate_stats(analyzed), args.repeats)
+    results['stats'] = timing_entry(runs)
+
+    results.update(seek_latencies(video_path, analyzed, np.random.default_rng(RANDOM_SEED)))
+
+    best = select_best_frames(analyzed, EXPORT_FRAMES)
+    with tempfile.TemporaryDirectory() as export_dir:
+        runs, (saved, _) = measure(lambda: export_frames(video_path, best, export_dir, 'bench',
+                                                    key_frames=np.flatnonzero(analyzed.key_frame),
+                                                    profile=EXPORT_PROFILES[args.export_profile]),
+                              args.repeats)
+    results['export'] = timing_entry(runs, frames=len(saved), fps=len(saved) / max(np.median(runs), 1e-9))
+
+    return results, mismatches
+
+
+def environment_info():
+    return {
+        'version': VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': available_cpu_count(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+    }
+
+
+def find_regressions(results, baseline, tolerance):
+    """baseline 대비 느려진 항목 목록 [(비디오, 항목, 기준 초, 현재 초)]"""
+    regressions = []
+    for video, entries in results.items():
+        base_entries = baseline.get('results', {}).get(video, {})
+        for name, entry in entries.items():
+            base = base_entries.get(name)
+            if base is None:
+                continue
+            old, new = base['seconds'], entry['seconds']
+            if new > old * (1 + tolerance) and new - old > MIN_REGRESSION_SECONDS:
+                regressions.append((video, name, old, new))
+    return regressions
+
+
+def print_results(results, baseline=None):
+    for video, entries in results.items():
+        print(f"\n{video}")
+        for name, entry in entries.items():
+            line = f"  {name:<18} {entry['seconds'] * 1000:10.1f} ms"
+            if 'fps' in entry:
+                line += f"  ({entry['fps']:.0f} fps)"
+            if 'p95_ms' in entry:
+                line += f"  (p95 {entry['p95_ms']:.1f} ms)"
+            base = (baseline or {}).get('results', {}).get(video, {}).get(name)
+            if base is not None and base['seconds'] > 0:
+                line += f"  [{(entry['seconds'] / base['seconds'] - 1) * 100:+.0f}%]"
+            print(line)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="합성 비디오로 프레임 정보/선명도 분석, 탐색, 내보내기 속도 측정")
+    parser.add_argument('--suite', choices=sorted(SUITES), default=DEFAULT_SUITE,
+                        help=f"측정할 합성 비디오 묶음 (기본: {DEFAULT_SUITE})")
+    parser.add_argument('--video-dir', default=None,
+                        help="합성 비디오를 만들어 둘 디렉터리 (기본: 임시 디렉터리, 지정하면 다시 사용)")
+    parser.add_argument('-o', '--output', default=None, help="측정 결과 JSON 저장 경로")
+    parser.add_argument('--baseline', default=None,
+                        help="비교할 기준 결과 JSON (느려진 항목이 있으면 종료 코드 1)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"성능 저하로 볼 기준 대비 증가율 (기본: {DEFAULT_TOLERANCE})")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help=f"항목별 반복 횟수, 중앙값 사용 (기본: {DEFAULT_REPEATS})")
+    parser.add_argument('--probe-mode', choices=('fast', 'full'), default='fast',
+                        help="프레임 정보 분석 방식 (기본: fast)")
+    parser.add_argument('--backend', choices=('opencv', 'ffmpeg'), default='opencv',
+                        help="선명도 분석 디코딩 방식 (기본: opencv)")
+    parser.add_argument('--analysis-width', type=int, default=0,
+                        help="분석 해상도 가로 픽셀 수 (기본: 0, 원본)")
+    parser.add_argument('--export-profile', choices=sorted(EXPORT_PROFILES), default='fast',
+                        help="내보내기 측정에 쓸 저장 설정 (기본: fast)")
+    parser.add_argument('-j', '--processes', type=int, default=0,
+                        help="분석 프로세스 수 (기본: 사용 가능한 CPU 코어 수)")
+    args = parser.parse_args(argv)
+    args.repeats = max(1, args.repeats)
+    return args
+
+
+def run_benchmarks(args):
+    """스위트 전체를 측정하고 (결과 dict, 불일치 dict) 반환"""
+    options = AnalysisOptions(backend=args.backend, analysis_width=args.analysis_width)
+    num_processes = args.processes or available_cpu_count()
+
+    temp_dir = None
+    video_dir = args.video_dir
+    if video_dir is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        video_dir = temp_dir.name
+
+    results = {}
+    mismatches = {}
+    try:
+        videos = [(spec, ensure_video(spec, video_dir)) for spec in SUITES[args.suite]]
+
+        # 풀 생성 시간은 측정에서 제외 (GUI/CLI 도 풀을 미리 만들어 둠)
+        with WorkerPool(num_processes) as pool:
+            pool.warm_up(wait=True)
+            for spec, video_path in videos:
+                print(f"[INFO] 측정 중: {spec.name}")
+                results[spec.name], video_mismatches = benchmark_video(video_path, args, options, pool)
+                if video_mismatches:
+                    mismatches[spec.name] = video_mismatches
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    return results, mismatches
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results, mismatches = run_benchmarks(args)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    report = {
+        'environment': environment_info(),
+        'suite': args.suite,
+        'videos': {spec.name: asdict(spec) for spec in SUITES[args.suite]},
+        'options': {'probe_mode': args.probe_mode, 'backend': args.backend,
+                    'analysis_width': args.analysis_width, 'export_profile': args.export_profile,
+                    'repeats': args.repeats},
+        'results': results,
+        'mismatches': mismatches,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[INFO] 측정 결과 저장: {args.output}")
+
+    failed = False
+    if mismatches:
+        failed = True
+        for video, columns in mismatches.items():
+            details = ', '.join(f"{name} {count}개" for name, count in columns.items())
+            print(f"[ERROR] 병렬 결과가 순차 결과와 다름: {video}: {details}")
+
+    if baseline is not None:
+        if baseline.get('environment', {}).get('cpus') != report['environment']['cpus']:
+            print("[WARN] 기준 결과와 CPU 코어 수가 달라 비교가 정확하지 않을 수 있음")
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for video, name, old, new in regressions:
+            print(f"[ERROR] 성능 저하: {video} {name}: {old * 1000:.1f} ms -> {new * 1000:.1f} ms")
+        if regressions:
+            failed = True
+        else:
+            print("[INFO] 기준 대비 성능 저하 없음")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,332 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+from analysis_cache import AnalysisCache
+from analyzer import (AnalysisFailed, AnalysisOptions, analyze_sharpness_parallel, analyze_sharpness_triage,
+                      available_cpu_count, cache_variant, probe_frame_table)
+from hash_index import DEFAULT_DUPLICATE_RADIUS, drop_near_duplicates
+from metrics import DEFAULT_METRICS, METRICS
+from probe import FRAME_TYPES
+from selection import frames_for_seconds, select_best_frames
+from tracing import TRACER
+from worker_pool import WorkerPool
+from version import VERSION
+
+
+# 디렉터리에서 찾을 비디오 확장자 (GUI 파일 열기 필터와 같음)
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv')
+REPORT_FORMATS = ('json', 'csv', 'npz')
+# JSON 요약에 넣을 선명도 상위 프레임 수
+DEFAULT_TOP_FRAMES = 20
+
+
+def collect_videos(inputs, recursive=False):
+    """파일/디렉터리 목록에서 비디오 파일 경로를 중복 없이 정렬해서 반환"""
+    videos = []
+    seen = set()
+
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            pattern = '**/*' if recursive else '*'
+            candidates = sorted(p for p in path.glob(pattern)
+                                if p.is_file() and p.suffix.lower() in VIDEO_EXTENSIONS)
+        elif path.is_file():
+            candidates = [path]
+        else:
+            print(f"[WARN] 파일을 찾을 수 없음: {item}")
+            continue
+
+        for candidate in candidates:
+            resolved = candidate.resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                videos.append(resolved)
+
+    return videos
+
+
+def report_stem(video_path, used_stems):
+    """출력 디렉터리 안에서 겹치지 않는 보고서 파일 이름 (확장자 제외)"""
+    stem = video_path.stem
+    candidate = stem
+    n = 2
+    while candidate in used_stems:
+        candidate = f"{stem}_{n}"
+        n += 1
+    used_stems.add(candidate)
+    return candidate
+
+
+def _float_or_none(value):
+    value = float(value)
+    return None if value != value else value
+
+
+def _frame_entry(frame_table, idx):
+    entry = {
+        'frame': int(idx),
+        'pts': _float_or_none(frame_table.pts[idx]),
+        'type': frame_table.frame_type(idx),
+        'size': int(frame_table.size[idx]),
+        'is_reference': bool(frame_table.is_reference[idx]),
+        'sharpness': float(frame_table.sharpness[idx]),
+    }
+    for name in frame_table.metrics:
+        entry[name] = frame_table.metric_at(name, idx)
+    return entry
+
+
+def build_summary(video_path, frame_table, probe_mode, options, elapsed, top_frames, best_frames=None):
+    """비디오 하나의 JSON 요약"""
+    analyzed = frame_table.analyzed_indices()
+    top = [_frame_entry(frame_table, idx) for idx in frame_table.top_k('sharpness', top_frames, analyzed)]
+
+    summary = {
+        'video': str(video_path),
+        'version': VERSION,
+        'probe_mode': probe_mode,
+        'options': asdict(options),
+        'frames': len(frame_table),
+        'analyzed_frames': len(analyzed),
+        'type_counts': {t: n for t, n in frame_table.type_counts().items() if n},
+        'avg_sizes': frame_table.avg_sizes,
+        'reference_frames': int(frame_table.is_reference.sum()),
+        'scene_cuts': frame_table.scene_cuts.tolist(),
+        'elapsed_sec': round(elapsed, 3),
+        'top_sharpness': top,
+    }
+    if frame_table.has_hashes():
+        groups = frame_table.duplicate_groups()
+        summary['duplicate_groups'] = int(groups.max()) + 1 if len(groups) else 0
+    if best_frames is not None:
+        summary['best_frames'] = [_frame_entry(frame_table, idx) for idx in best_frames]
+    return summary
+
+
+def write_csv(path, frame_table):
+    """프레임별 모든 열을 한 줄씩 기록"""
+    metric_names = list(frame_table.metrics)
+    columns = [
+        np.arange(len(frame_table)).tolist(),
+        [FRAME_TYPES[code] for code in frame_table.type_code.tolist()],
+        frame_table.size.tolist(),
+        frame_table.quality.tolist(),
+        frame_table.key_frame.astype(np.int8).tolist(),
+        frame_table.is_reference.astype(np.int8).tolist(),
+        frame_table.pts.tolist(),
+        frame_table.sharpness.tolist(),
+    ] + [frame_table.metrics[name].tolist() for name in metric_names]
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['frame', 'type', 'size', 'quality', 'key_frame', 'is_reference', 'pts', 'sharpness']
+                        + metric_names)
+        # NaN 은 빈 칸으로 기록
+        for row in zip(*columns):
+            writer.writerow(['' if isinstance(v, float) and v != v else v for v in row])
+
+
+def write_reports(output_dir, stem, video_path, frame_table, probe_mode, options, elapsed, formats, top_frames,
+                  best_frames=None):
+    if 'json' in formats:
+        summary = build_summary(video_path, frame_table, probe_mode, options, elapsed, top_frames, best_frames)
+        with open(output_dir / f'{stem}.json', 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    if 'csv' in formats:
+        write_csv(output_dir / f'{stem}.csv', frame_table)
+
+    if 'npz' in formats:
+        np.savez_compressed(output_dir / f'{stem}.npz', **frame_table.to_arrays())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='비디오 프레임 일괄 분석 (GUI 없이 실행, 비디오별 JSON/CSV/NPZ 보고서 저장)')
+    parser.add_argument('inputs', nargs='+', help='비디오 파일 또는 디렉터리')
+    parser.add_argument('-o', '--output', default='reports', help='보고서 저장 디렉터리 (기본: reports)')
+    parser.add_argument('-r', '--recursive', action='store_true', help='하위 디렉터리까지 검색')
+    parser.add_argument('--format', default='json,csv',
+                        help=f"보고서 형식, 쉼표로 구분 ({', '.join(REPORT_FORMATS)}, 기본: json,csv)")
+    parser.add_argument('--probe-mode', choices=('fast', 'full'), default='full',
+                        help='fast: 패킷 정보만 사용 (키프레임 외 타입 미상), '
+                             'full: 프레임 디코딩으로 I/P/B 타입까지 분석 (기본)')
+    parser.add_argument('--backend', choices=('opencv', 'ffmpeg'), default='opencv', help='선명도 분석 디코딩 방식')
+    parser.add_argument('--analysis-width', type=int, default=0, help='분석 해상도의 가로 픽셀 수 (0: 원본)')
+    parser.add_argument('--low-precision', action='store_true', help='CV_16S 라플라시안 사용')
+    parser.add_argument('--metrics', default=','.join(DEFAULT_METRICS),
+                        help=f"함께 계산할 지표, 쉼표로 구분 ({', '.join(METRICS)}, "
+                             f"기본: {','.join(DEFAULT_METRICS)})")
+    parser.add_argument('-j', '--processes', type=int, default=0, help='분석 프로세스 수 (0: 사용 가능한 코어 수)')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP_FRAMES, help='JSON 요약에 넣을 선명도 상위 프레임 수')
+    parser.add_argument('--no-cache', action='store_true', help='분석 캐시를 읽거나 쓰지 않음')
+    parser.add_argument('--triage', type=float, default=0, metavar='PERCENT',
+                        help='패킷 크기/QP/키프레임 거리로 고른 상위 PERCENT%% 프레임만 디코딩해서 분석 (0: 전체 분석)')
+    parser.add_argument('--best', type=int, default=0,
+                        help='베스트 프레임 자동 선택 개수 (0: 사용 안 함, JSON 요약에 기록)')
+    parser.add_argument('--best-gap', type=float, default=2.0, help='베스트 프레임 사이 최소 간격 (초)')
+    parser.add_argument('--prefer-reference', action='store_true', help='베스트 프레임 선택 시 참조/I 프레임 우대')
+    parser.add_argument('--best-per-scene', action='store_true', help='베스트 프레임을 장면마다 최대 하나씩 선택')
+    parser.add_argument('--dedupe-radius', type=int, default=DEFAULT_DUPLICATE_RADIUS,
+                        help='베스트 프레임에서 dHash 해밍 거리가 이 값 이하인 프레임 제외 (음수: 사용 안 함)')
+    parser.add_argument('--export-best', action='store_true',
+                        help='베스트 프레임을 보고서 디렉터리 아래 <비디오 이름>/ 에 WebP 로 저장')
+    parser.add_argument('--export-profile', default=None,
+                        help='내보내기 WebP 설정 이름 (exporter.EXPORT_PROFILES, 기본: capture)')
+    parser.add_argument('--export-workers', type=int, default=0, help='WebP 인코딩 스레드 수 (0: 코어 수)')
+    parser.add_argument('--trace', default=None,
+                        help='단계별 시간을 Chrome 트레이스 JSON 으로 저장 (chrome://tracing, Perfetto 에서 열기)')
+
+    args = parser.parse_args(argv)
+
+    args.formats = [f.strip() for f in args.format.split(',') if f.strip()]
+    unknown = [f for f in args.formats if f not in REPORT_FORMATS]
+    if unknown:
+        parser.error(f"알 수 없는 보고서 형식: {', '.join(unknown)}")
+
+    if args.export_best:
+        # 내보내기 모듈 (PIL) 은 내보낼 때만 불러옴 (분석만 하는 실행은 import 비용 없음)
+        from exporter import DEFAULT_EXPORT_PROFILE, EXPORT_PROFILES
+        args.export_profile = args.export_profile or DEFAULT_EXPORT_PROFILE
+        if args.export_profile not in EXPORT_PROFILES:
+            parser.error(f"알 수 없는 내보내기 설정: {args.export_profile} (가능: {', '.join(EXPORT_PROFILES)})")
+
+    if not 0 <= args.triage <= 100:
+        parser.error("--triage 는 0 ~ 100 사이여야 함")
+
+    args.metric_names = tuple(m.strip() for m in args.metrics.split(',') if m.strip())
+    unknown = [m for m in args.metric_names if m not in METRICS]
+    if unknown:
+        parser.error(f"알 수 없는 지표: {', '.join(unknown)}")
+
+    return args
+
+
+def run_batch(args):
+    """모든 비디오를 하나의 프로세스 풀로 분석하고 보고서 저장, 실패한 비디오 수 반환"""
+    videos = collect_videos(args.inputs, args.recursive)
+    if not videos:
+        print("[WARN] 분석할 비디오가 없음")
+        return 0
+
+    options = AnalysisOptions(backend=args.backend, analysis_width=args.analysis_width,
+                              low_precision=args.low_precision, metrics=args.metric_names)
+    variant = cache_variant(args.probe_mode, options)
+    if args.triage > 0:
+        # 일부 프레임만 분석한 결과가 전체 분석 캐시를 대신하지 않도록 따로 보관
+        variant = f"{variant}-triage{args.triage:g}"
+    cache = None if args.no_cache else AnalysisCache()
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    used_stems = set()
+    failed = 0
+
+    num_processes = args.processes or available_cpu_count()
+    print(f"[INFO] 비디오 {len(videos)}개, 프로세스 {num_processes}개, 보고서: {output_dir}")
+
+    batch_start = time.monotonic()
+
+    # 한 비디오를 분석하는 동안 다음 비디오의 ffprobe 를 미리 실행
+    # 비디오마다 프로세스를 새로 만들지 않도록 하나의 풀을 끝까지 재사용
+    with WorkerPool(num_processes) as pool, ThreadPoolExecutor(max_workers=1) as probe_executor:
+        # 첫 비디오의 ffprobe 와 작업 프로세스 시작을 겹쳐서 진행
+        pool.warm_up()
+
+        def submit_probe(video_path):
+            cached = cache.get(video_path, variant=variant) if cache is not None else None
+            if cached is not None:
+                return None, cached
+            return probe_executor.submit(probe_frame_table, str(video_path), args.probe_mode), None
+
+        pending = submit_probe(videos[0])
+
+        for i, video_path in enumerate(videos):
+            probe_future, frame_table = pending
+            if i + 1 < len(videos):
+                pending = submit_probe(videos[i + 1])
+
+            print(f"[INFO] ({i + 1}/{len(videos)}) {video_path}")
+            start = time.monotonic()
+
+            try:
+                if frame_table is not None:
+                    print("[INFO] 캐시된 분석 결과 사용")
+                else:
+                    frame_table = probe_future.result()
+                    # 실패하거나 일부 프레임만 분석되면 AnalysisFailed (캐시에 쓰지 않고 실패로 셈)
+                    if args.triage > 0:
+                        analyze_sharpness_triage(str(video_path), frame_table, options, args.triage / 100, pool=pool)
+                    else:
+                        analyze_sharpness_parallel(str(video_path), frame_table, options, pool=pool)
+                    if cache is not None:
+                        cache.put(video_path, frame_table, variant=variant)
+
+                best_frames = None
+                if args.best > 0:
+                    best_frames = select_best_frames(frame_table, args.best,
+                                                     min_gap=frames_for_seconds(frame_table, args.best_gap),
+                                                     boundaries=frame_table.scene_cuts if args.best_per_scene else None,
+                                                     prefer_reference=args.prefer_reference)
+                    if args.dedupe_radius >= 0 and frame_table.has_hashes():
+                        best_frames = drop_near_duplicates(best_frames, frame_table.metrics['dhash'],
+                                                           args.dedupe_radius)
+
+                elapsed = time.monotonic() - start
+                stem = report_stem(video_path, used_stems)
+                write_reports(output_dir, stem, video_path, frame_table, args.probe_mode, options, elapsed,
+                              args.formats, args.top, best_frames)
+
+                if best_frames is not None and args.export_best:
+                    from exporter import EXPORT_PROFILES, export_frames
+                    saved, export_failed = export_frames(str(video_path), best_frames, output_dir / stem,
+                                                         video_path.stem,
+                                                         key_frames=np.flatnonzero(frame_table.key_frame),
+                                                         profile=EXPORT_PROFILES[args.export_profile],
+                                                         workers=args.export_workers)
+                    print(f"[INFO] 베스트 프레임 {len(saved)}개 저장: {output_dir / stem}")
+                    if export_failed:
+                        print(f"[ERROR] 베스트 프레임 {len(export_failed)}개 저장 실패: {video_path}: "
+                              f"{export_failed}")
+                        failed += 1
+
+            except AnalysisFailed as e:
+                print(f"[ERROR] 선명도 분석 미완료, 캐시/보고서 저장 안 함: {video_path}: {e}")
+                failed += 1
+
+            except Exception as e:
+                print(f"[ERROR] 분석 실패: {video_path}: {e}")
+                failed += 1
+
+    total = time.monotonic() - batch_start
+    print(f"[INFO] 일괄 분석 완료: {len(videos) - failed}개 성공, {failed}개 실패, {total:.1f}초")
+    return failed
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    TRACER.enabled = bool(args.trace)
+
+    failed = run_batch(args)
+
+    if args.trace:
+        TRACER.print_summary()
+        TRACER.write(args.trace)
+        print(f"[INFO] 트레이스 저장: {args.trace}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,141 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from frame_reader import FrameReader
+from tracing import traced
+
+
+@dataclass(frozen=True)
+class ExportProfile:
+    """WebP 저장 설정
+
+    quality  : 0~100
+    method   : 0(빠름)~6(느림, 가장 작은 파일)
+    max_size : 긴 변 기준 최대 크기 (px, 0 이면 원본 크기)
+    """
+    quality: int = 75
+    method: int = 6
+    max_size: int = 384
+
+
+# 이름 -> 저장 설정 (capture 는 기존 캡처와 같은 설정)
+EXPORT_PROFILES = {
+    'capture': ExportProfile(),
+    'fast': ExportProfile(quality=75, method=4, max_size=384),
+    'full': ExportProfile(quality=90, method=4, max_size=0),
+}
+DEFAULT_EXPORT_PROFILE = 'capture'
+
+# 인코딩 대기열 길이 (스레드당), 디코딩이 인코딩보다 빠를 때 메모리 상한
+PENDING_PER_WORKER = 2
+
+
+@traced('save_webp', 'export')
+def save_webp(frame, save_path, profile=EXPORT_PROFILES[DEFAULT_EXPORT_PROFILE]):
+    """BGR 프레임을 긴 변이 profile.max_size 이하가 되도록 줄여서 WebP 로 저장
+
+    Pillow 는 리사이즈/인코딩 중에 GIL 을 놓으므로 여러 스레드에서 동시에 호출해도 병렬로 동작함
+    """
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    pil_image = Image.fromarray(frame_rgb)
+
+    # thumbnail 은 비율을 유지하며, 이미 작으면 그대로 둠
+    if profile.max_size:
+        pil_image.thumbnail((profile.max_size, profile.max_size), Image.Resampling.LANCZOS)
+
+    pil_image.save(save_path, 'WebP', quality=profile.quality, method=profile.method)
+
+
+def export_file_name(prefix, frame_index):
+    return f'{prefix}_{frame_index:06d}.webp'
+
+
+def read_frame_list(path):
+    """파일에서 프레임 번호 목록 읽기 (공백/쉼표/줄바꿈 구분, # 뒤는 주석)"""
+    indices = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0]
+            indices.extend(int(token) for token in re.split(r'[\s,]+', line) if token)
+    return indices
+
+
+def default_export_workers():
+    return max(1, os.cpu_count() or 1)
+
+
+@traced('export_frames', 'export')
+def export_frames(video_path, frame_indices, output_dir, prefix, key_frames=None, profile=None,
+                  workers=0, on_progress=None, cancel_event=None):
+    """frame_indices 프레임들을 output_dir 에 WebP 로 저장하고 (저장한 경로 목록, 실패한 프레임 목록) 반환
+
+    디코딩이나 인코딩에 실패한 프레임도 진행률에 포함되고, 실패 목록으로 호출한 쪽에 알림
+
+    인덱스를 정렬해서 앞으로만 디코딩하므로, 같은 GOP 안의 프레임은 탐색 없이
+    이어서 읽고 다른 GOP 로 넘어갈 때만 키프레임으로 탐색함. 디코딩은 이 스레드에서
+    순서대로, 인코딩은 workers 개 스레드에서 병렬로 진행
+    """
+    if profile is None:
+        profile = EXPORT_PROFILES[DEFAULT_EXPORT_PROFILE]
+    workers = workers or default_export_workers()
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    targets = np.unique(np.asarray(frame_indices, dtype=np.int64))
+    # 지나온 프레임을 쌓아 둘 필요가 없으므로 캐시는 최소로
+    reader = FrameReader(video_path, key_frames, cache_bytes=0)
+    saved = []
+    failed = []
+    pending = []
+    done = 0
+
+    def report():
+        nonlocal done
+        done += 1
+        if on_progress is not None:
+            on_progress(done, len(targets))
+
+    def finish(future_item):
+        idx, save_path, future = future_item
+        try:
+            future.result()
+            saved.append(save_path)
+        except Exception as e:
+            print(f"[WARN] 저장 실패: {save_path}: {e}")
+            failed.append(idx)
+        report()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for idx in targets.tolist():
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+
+                frame = reader.read(idx)
+                if frame is None:
+                    print(f"[WARN] 프레임 {idx} 디코딩 실패")
+                    failed.append(idx)
+                    report()
+                    continue
+
+                save_path = output_dir / export_file_name(prefix, idx)
+                pending.append((idx, save_path, executor.submit(save_webp, frame, save_path, profile)))
+
+                # 대기열이 차면 가장 오래된 작업부터 끝나기를 기다림
+                while len(pending) >= workers * PENDING_PER_WORKER:
+                    finish(pending.pop(0))
+
+            for item in pending:
+                finish(item)
+    finally:
+        reader.release()
+
+    return saved, sorted(failed)
@@ -0,0 +1,214 @@
+import threading
+from collections import OrderedDict, deque
+
+import cv2
+import numpy as np
+
+from tracing import span
+
+
+# 디코딩된 프레임 캐시의 기본 메모리 예산
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+# 미리 읽기 링 버퍼의 메모리 예산
+PREFETCH_BUFFER_BYTES = 256 * 1024 * 1024
+# 미리 읽기 디코더가 자체적으로 쓰는 GOP 캐시 예산 (뒤로 이동할 때 사용)
+PREFETCH_READER_CACHE_BYTES = 128 * 1024 * 1024
+# 현재 위치에서 진행 방향으로 미리 디코딩할 프레임 수
+PREFETCH_DEPTH = 8
+
+
+class DecodedFrameCache:
+    """디코딩된 프레임을 메모리 예산(bytes) 안에서 보관하는 LRU 캐시"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._frames = OrderedDict()
+
+    def __contains__(self, frame_number):
+        return frame_number in self._frames
+
+    def __len__(self):
+        return len(self._frames)
+
+    def get(self, frame_number):
+        frame = self._frames.get(frame_number)
+        if frame is not None:
+            self._frames.move_to_end(frame_number)
+        return frame
+
+    def put(self, frame_number, frame):
+        old = self._frames.pop(frame_number, None)
+        if old is not None:
+            self.total_bytes -= old.nbytes
+
+        self._frames[frame_number] = frame
+        self.total_bytes += frame.nbytes
+
+        # 예산을 넘으면 가장 오래 안 쓴 프레임부터 제거 (방금 넣은 프레임은 유지)
+        while self.total_bytes > self.max_bytes and len(self._frames) > 1:
+            _, evicted = self._frames.popitem(last=False)
+            self.total_bytes -= evicted.nbytes
+
+    def clear(self):
+        self._frames.clear()
+        self.total_bytes = 0
+
+
+class FrameReader:
+    """키프레임 위치를 기준으로 탐색하고, 디코딩한 프레임을 LRU 캐시에 보관
+
+    뒤로 이동할 때는 대상이 속한 GOP 의 키프레임으로 탐색한 뒤 대상까지
+    디코딩하면서 지나온 프레임을 모두 캐시하므로, 같은 GOP 안에서의
+    좌우 이동은 메모리에서 바로 반환됨
+    """
+
+    def __init__(self, video_path, key_frames=None, cache_bytes=DEFAULT_CACHE_BYTES):
+        self.video_path = video_path
+        self.capture = cv2.VideoCapture(video_path)
+        self.cache = DecodedFrameCache(cache_bytes)
+        self.key_frames = np.empty(0, dtype=np.int64)
+        # 다음 capture.read() 가 반환할 프레임 번호 (-1 이면 알 수 없음)
+        self.next_frame = 0
+        self.lock = threading.Lock()
+
+        if key_frames is not None:
+            self.set_key_frames(key_frames)
+
+    def is_opened(self):
+        return self.capture.isOpened()
+
+    def get(self, prop):
+        return self.capture.get(prop)
+
+    def set_key_frames(self, key_frames):
+        """키프레임 인덱스 (FrameTable.key_frame 에서 추출) 설정"""
+        self.key_frames = np.sort(np.asarray(key_frames, dtype=np.int64))
+
+    def keyframe_before(self, frame_number):
+        """frame_number 이하에서 가장 가까운 키프레임 (모르면 None)"""
+        if len(self.key_frames) == 0:
+            return None
+        pos = int(np.searchsorted(self.key_frames, frame_number, side='right')) - 1
+        return int(self.key_frames[pos]) if pos >= 0 else 0
+
+    def read(self, frame_number, cancel=None):
+        """frame_number 프레임(BGR) 반환, 실패하거나 cancel() 이 True 가 되면 None"""
+        with self.lock:
+            frame = self.cache.get(frame_number)
+            if frame is not None:
+                return frame
+
+            key_frame = self.keyframe_before(frame_number)
+
+            if key_frame is None:
+                # 키프레임 정보가 없으면 OpenCV 탐색에 맡김
+                if self.next_frame != frame_number:
+                    with span('seek', 'reader', frame=frame_number):
+                        self.capture.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                    self.next_frame = frame_number
+            elif not (key_frame <= self.next_frame <= frame_number):
+                # 같은 GOP 안에서 앞쪽에 있지 않으면 키프레임으로 정확히 탐색
+                with span('seek', 'reader', frame=key_frame):
+                    self.capture.set(cv2.CAP_PROP_POS_FRAMES, key_frame)
+                self.next_frame = key_frame
+
+            with span('decode', 'reader', frame=frame_number, frames=frame_number - self.next_frame + 1):
+                while self.next_frame <= frame_number:
+                    # 더 새로운 요청이 들어왔으면 중간에 포기 (디코더 위치는 그대로 유효)
+                    if cancel is not None and cancel():
+                        return None
+
+                    ret, frame = self.capture.read()
+                    if not ret or frame is None:
+                        self.next_frame = -1
+                        return None
+
+                    self.cache.put(self.next_frame, frame)
+                    self.next_frame += 1
+
+            return frame
+
+    def release(self):
+        with self.lock:
+            self.capture.release()
+            self.cache.clear()
+
+
+class PrefetchDecoder(threading.Thread):
+    """탐색 방향과 보폭을 추적해서 다음에 볼 프레임을 미리 디코딩하는 스레드
+
+    notify() 로 이동할 때마다 알려주면 직전 이동과의 차이(±1 프레임,
+    ±fps 점프 등)를 보폭으로 삼아 그 방향으로 depth 개를 미리 디코딩해서
+    링 버퍼에 넣어 둠. GUI 스레드는 get() 으로 버퍼만 조회
+    """
+
+    def __init__(self, video_path, key_frames=None, total_frames=0, max_step=30,
+                 depth=PREFETCH_DEPTH, buffer_bytes=PREFETCH_BUFFER_BYTES):
+        super().__init__(daemon=True)
+        # GUI 쪽 FrameReader 와 디코더를 공유하지 않도록 별도로 열기
+        self.reader = FrameReader(video_path, key_frames, cache_bytes=PREFETCH_READER_CACHE_BYTES)
+        self.buffer = DecodedFrameCache(buffer_bytes)
+        self.total_frames = total_frames
+        self.max_step = max_step
+        self.depth = depth
+
+        self.condition = threading.Condition()
+        self.targets = deque()
+        self.last_request = None
+        self.step = 0
+        self.stopped = False
+
+    def set_key_frames(self, key_frames):
+        self.reader.set_key_frames(key_frames)
+
+    def get(self, frame_number):
+        """미리 디코딩된 프레임 반환, 없으면 None"""
+        with self.condition:
+            return self.buffer.get(frame_number)
+
+    def notify(self, frame_number):
+        """frame_number 로 이동했음을 알리고 미리 읽을 목록을 다시 계산"""
+        with self.condition:
+            if self.last_request is not None:
+                step = frame_number - self.last_request
+                if step != 0:
+                    # 슬라이더 클릭 같은 큰 점프는 방향 예측에 쓰지 않음
+                    self.step = step if abs(step) <= self.max_step else 0
+            self.last_request = frame_number
+
+            self.targets.clear()
+            if self.step:
+                for i in range(1, self.depth + 1):
+                    target = frame_number + self.step * i
+                    if target < 0 or (self.total_frames and target >= self.total_frames):
+                        break
+                    if target not in self.buffer:
+                        self.targets.append(target)
+
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.stopped and not self.targets:
+                    self.condition.wait()
+                if self.stopped:
+                    break
+                target = self.targets.popleft()
+
+            frame = self.reader.read(target)
+
+            if frame is not None:
+                with self.condition:
+                    self.buffer.put(target, frame)
+
+        self.reader.release()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.targets.clear()
+            self.condition.notify()
+        if self.is_alive():
+            self.join()
@@ -0,0 +1,319 @@
+import numpy as np
+
+from hash_index import DEFAULT_DUPLICATE_RADIUS, group_near_duplicates
+from probe import FRAME_TYPES, FRAME_TYPE_CODES
+
+
+# 평균 크기를 계산하는 프레임 타입
+SIZE_STAT_TYPES = ('I', 'P', 'B', '?')
+# 크기 기반 추가 참조 프레임 탐지 대상 타입
+# ('?' 는 빠른 분석에서 P/B 가 섞인 것이라 평균이 의미 없고 P 프레임 대부분이 참조로 잡히므로 제외)
+REFERENCE_CANDIDATE_TYPES = ('P', 'B')
+# 타입 평균 대비 이 배율보다 크면 참조 프레임으로 간주
+REFERENCE_SIZE_RATIO = 1.5
+# to_arrays()/from_arrays() 에서 추가 지표 열 이름 앞에 붙이는 접두사
+METRIC_PREFIX = 'metric_'
+# 분석 결과 dict 에서 열(column)이 아닌 항목
+NON_COLUMN_KEYS = ('frame_index', 'boundary')
+# 직전 프레임과의 히스토그램 거리가 이 값보다 크면 장면 전환으로 간주
+SCENE_CUT_THRESHOLD = 0.35
+# 이보다 짧은 장면은 만들지 않음 (플래시 등으로 연달아 검출되는 것 방지)
+MIN_SCENE_FRAMES = 10
+
+
+def top_k_indices(values, k, descending=True):
+    """values 에서 상위 k개의 위치를 순위 순서로 반환 (전체 정렬 없이 argpartition 사용)"""
+    n = len(values)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    keys = -values if descending else values
+
+    if k < n:
+        part = np.argpartition(keys, k - 1)[:k]
+    else:
+        part = np.arange(n)
+
+    # 상위 k개만 정렬 (동점이면 앞 프레임 우선)
+    order = np.lexsort((part, keys[part]))
+    return part[order]
+
+
+class FrameTable:
+    """프레임별 메타데이터를 열(column) 단위 NumPy 배열로 보관
+
+    type_code    : uint8   (FRAME_TYPES 의 인덱스)
+    size         : int64   패킷 크기 (bytes)
+    quality      : float64 QP (없으면 NaN)
+    key_frame    : bool
+    is_reference : bool
+    sharpness    : float64 라플라시안 분산 (미분석이면 NaN)
+    pts          : float64 표시 시각 (초, 없으면 NaN)
+
+    metrics 에는 그 외 지표(tenengrad, noise 등)가 열 이름 -> float64 배열로 들어감
+    (dhash 처럼 정수형 열은 NaN 대신 sharpness 가 분석된 프레임만 유효).
+    scene_cuts 는 장면 시작 프레임 번호 배열 (항상 0 부터 시작, metrics['scene_diff'] 에서 계산)
+    """
+
+    COLUMNS = ('type_code', 'size', 'quality', 'key_frame', 'is_reference', 'sharpness', 'pts')
+
+    def __init__(self, type_code, size, quality, key_frame, pts, is_reference=None, sharpness=None,
+                 metrics=None, scene_cuts=None):
+        n = len(type_code)
+        self.type_code = np.asarray(type_code, dtype=np.uint8)
+        self.size = np.asarray(size, dtype=np.int64)
+        self.quality = np.asarray(quality, dtype=np.float64)
+        self.key_frame = np.asarray(key_frame, dtype=np.bool_)
+        self.pts = np.asarray(pts, dtype=np.float64)
+
+        if is_reference is None:
+            is_reference = (self.type_code == FRAME_TYPE_CODES['I']) | self.key_frame
+        self.is_reference = np.asarray(is_reference, dtype=np.bool_)
+
+        if sharpness is None:
+            sharpness = np.full(n, np.nan, dtype=np.float64)
+        self.sharpness = np.asarray(sharpness, dtype=np.float64)
+
+        self.metrics = {}
+        for name, values in (metrics or {}).items():
+            values = np.asarray(values)
+            self.metrics[name] = values if values.dtype.kind in 'iu' else values.astype(np.float64)
+        # radius -> 묶음 번호 배열 (지표가 바뀌면 비움)
+        self._duplicate_groups = {}
+
+        self.avg_sizes = self.compute_avg_sizes()
+
+        if scene_cuts is None:
+            self.detect_scene_cuts()
+        else:
+            self.scene_cuts = np.asarray(scene_cuts, dtype=np.int64)
+
+    @classmethod
+    def from_probe(cls, probe):
+        n = probe.count
+        return cls(probe.type_code[:n], probe.size[:n], probe.quality[:n],
+                   probe.key_frame[:n], probe.pts[:n])
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        metrics = {name[len(METRIC_PREFIX):]: arrays[name]
+                   for name in arrays.keys() if name.startswith(METRIC_PREFIX)}
+        scene_cuts = arrays['scene_cuts'] if 'scene_cuts' in arrays.keys() else None
+        return cls(**{name: arrays[name] for name in cls.COLUMNS}, metrics=metrics, scene_cuts=scene_cuts)
+
+    def to_arrays(self):
+        arrays = {name: getattr(self, name) for name in self.COLUMNS}
+        for name, values in self.metrics.items():
+            arrays[METRIC_PREFIX + name] = values
+        arrays['scene_cuts'] = self.scene_cuts
+        return arrays
+
+    def __len__(self):
+        return len(self.type_code)
+
+    # ---- 개별 프레임 조회 ----
+
+    def frame_type(self, idx):
+        return FRAME_TYPES[self.type_code[idx]]
+
+    def quality_at(self, idx):
+        """QP 값 (없으면 None, 정수면 int)"""
+        quality = float(self.quality[idx])
+        if quality != quality:
+            return None
+        return int(quality) if quality.is_integer() else quality
+
+    def has_quality(self):
+        return bool(np.any(~np.isnan(self.quality)))
+
+    # ---- 집계 ----
+
+    def type_mask(self, frame_type):
+        return self.type_code == FRAME_TYPE_CODES[frame_type]
+
+    def type_counts(self):
+        counts = np.bincount(self.type_code, minlength=len(FRAME_TYPES))
+        return {t: int(counts[i]) for i, t in enumerate(FRAME_TYPES)}
+
+    def compute_avg_sizes(self):
+        """타입별 평균 크기 (해당 타입 프레임이 없으면 키 없음)"""
+        counts = np.bincount(self.type_code, minlength=len(FRAME_TYPES))
+        sums = np.bincount(self.type_code, weights=self.size, minlength=len(FRAME_TYPES))
+
+        avg_sizes = {}
+        for ftype in SIZE_STAT_TYPES:
+            code = FRAME_TYPE_CODES[ftype]
+            if counts[code]:
+                avg_sizes[ftype] = float(sums[code] / counts[code])
+        return avg_sizes
+
+    def apply_reference_heuristic(self, ratio=REFERENCE_SIZE_RATIO):
+        """타입 평균보다 ratio 배 이상 큰 P/B 프레임도 참조 프레임으로 표시
+
+        실제 픽처 타입을 아는 프레임에만 적용 (빠른 분석의 타입 미상 '?' 프레임은 키프레임만 참조)
+        """
+        avg_by_code = np.zeros(len(FRAME_TYPES), dtype=np.float64)
+        for ftype in REFERENCE_CANDIDATE_TYPES:
+            avg_by_code[FRAME_TYPE_CODES[ftype]] = self.avg_sizes.get(ftype, 0)
+
+        avg = avg_by_code[self.type_code]
+        self.is_reference |= (avg > 0) & (self.size > avg * ratio)
+
+    def size_ratio(self, idx):
+        """타입 평균 대비 크기 비율 (%)"""
+        avg_size = self.avg_sizes.get(self.frame_type(idx), 1)
+        return (self.size[idx] / avg_size) * 100 if avg_size > 0 else 100
+
+    # ---- 인덱스 / 순위 ----
+
+    def indices_of_types(self, frame_types):
+        codes = [FRAME_TYPE_CODES[t] for t in frame_types]
+        return np.flatnonzero(np.isin(self.type_code, codes))
+
+    def analyzed_indices(self):
+        return np.flatnonzero(~np.isnan(self.sharpness))
+
+    def set_sharpness(self, frame_indices, values):
+        self.sharpness[np.asarray(frame_indices, dtype=np.int64)] = values
+
+    def set_metrics(self, frame_indices, columns):
+        """지표 열들을 한 번에 기록 (columns: 열 이름 -> 값 배열, frame_index 열은 무시)"""
+        frame_indices = np.asarray(frame_indices, dtype=np.int64)
+        for name, values in columns.items():
+            if name in NON_COLUMN_KEYS:
+                continue
+            if name == 'sharpness':
+                self.sharpness[frame_indices] = values
+                continue
+            if name not in self.metrics:
+                values = np.asarray(values)
+                if values.dtype.kind in 'iu':
+                    self.metrics[name] = np.zeros(len(self), dtype=values.dtype)
+                else:
+                    self.metrics[name] = np.full(len(self), np.nan, dtype=np.float64)
+            self.metrics[name][frame_indices] = values
+        self.metrics_changed()
+
+    def use_columns(self, columns):
+        """sharpness/지표 열을 주어진 배열로 교체 (복사하지 않음, 공유 메모리 배열도 그대로 사용)"""
+        for name, values in columns.items():
+            if name == 'sharpness':
+                self.sharpness = values
+            else:
+                self.metrics[name] = values
+        self.metrics_changed()
+
+    def metrics_changed(self):
+        """지표 값이 바뀌었을 때 (다른 프로세스가 직접 쓴 경우 포함) 지표에서 계산한 캐시 비우기"""
+        self._duplicate_groups = {}
+
+    def column(self, name):
+        """기본 열 또는 추가 지표 열"""
+        if name in self.metrics:
+            return self.metrics[name]
+        return getattr(self, name)
+
+    def metric_at(self, name, idx):
+        """idx 프레임의 지표 값 (열이 없거나 미분석이면 None)"""
+        values = self.metrics.get(name)
+        if values is None:
+            return None
+        if values.dtype.kind in 'iu':
+            return int(values[idx]) if not np.isnan(self.sharpness[idx]) else None
+        if np.isnan(values[idx]):
+            return None
+        return float(values[idx])
+
+    def top_k(self, column, k, indices=None, descending=True):
+        """column 기준 상위 k개 프레임 인덱스 (indices 로 대상 제한 가능)"""
+        values = self.column(column)
+        if indices is None:
+            return top_k_indices(values, k, descending)
+        indices = np.asarray(indices, dtype=np.int64)
+        return indices[top_k_indices(values[indices], k, descending)]
+
+    def rank(self, column, indices, descending=True):
+        """indices 전체를 column 기준으로 정렬 (동점이면 앞 프레임 우선)"""
+        indices = np.asarray(indices, dtype=np.int64)
+        return indices[top_k_indices(self.column(column)[indices], len(indices), descending)]
+
+    # ---- 장면 ----
+
+    def detect_scene_cuts(self, threshold=SCENE_CUT_THRESHOLD, min_length=MIN_SCENE_FRAMES):
+        """scene_diff 가 threshold 를 넘는 프레임을 장면 시작으로 보고 scene_cuts 갱신"""
+        if len(self) == 0:
+            self.scene_cuts = np.empty(0, dtype=np.int64)
+            return self.scene_cuts
+
+        cuts = [0]
+        diff = self.metrics.get('scene_diff')
+        if diff is not None:
+            # NaN (미분석) 은 비교 결과가 False 라서 자동으로 제외됨
+            with np.errstate(invalid='ignore'):
+                candidates = np.flatnonzero(diff > threshold)
+            for idx in candidates.tolist():
+                if idx - cuts[-1] >= min_length:
+                    cuts.append(idx)
+
+        self.scene_cuts = np.asarray(cuts, dtype=np.int64)
+        return self.scene_cuts
+
+    def scene_of(self, idx):
+        """idx 프레임이 속한 장면 번호 (0부터)"""
+        return int(np.searchsorted(self.scene_cuts, idx, side='right')) - 1
+
+    def next_scene_start(self, idx):
+        """idx 다음 장면의 시작 프레임 (없으면 None)"""
+        pos = int(np.searchsorted(self.scene_cuts, idx, side='right'))
+        return int(self.scene_cuts[pos]) if pos < len(self.scene_cuts) else None
+
+    def previous_scene_start(self, idx):
+        """idx 보다 앞의 장면 시작 프레임 (장면 중간이면 현재 장면의 시작, 없으면 None)"""
+        pos = int(np.searchsorted(self.scene_cuts, idx, side='left')) - 1
+        return int(self.scene_cuts[pos]) if pos >= 0 else None
+
+    def scene_lengths(self):
+        return np.diff(np.append(self.scene_cuts, len(self)))
+
+    def scene_stats(self, column='sharpness'):
+        """장면별 (가장 높은 column 프레임, column 평균) — 분석된 프레임이 없는 장면은 -1, NaN"""
+        n_scenes = len(self.scene_cuts)
+        best = np.full(n_scenes, -1, dtype=np.int64)
+        means = np.full(n_scenes, np.nan, dtype=np.float64)
+
+        values = self.column(column)
+        analyzed = np.flatnonzero(~np.isnan(values))
+        if n_scenes == 0 or len(analyzed) == 0:
+            return best, means
+
+        scene_ids = np.searchsorted(self.scene_cuts, analyzed, side='right') - 1
+        scores = values[analyzed]
+
+        # 장면 번호 순, 같은 장면 안에서는 점수 내림차순 -> 장면마다 첫 항목이 최고점
+        order = np.lexsort((analyzed, -scores, scene_ids))
+        sorted_ids = scene_ids[order]
+        first = np.ones(len(order), dtype=np.bool_)
+        first[1:] = sorted_ids[1:] != sorted_ids[:-1]
+        best[sorted_ids[first]] = analyzed[order[first]]
+
+        counts = np.bincount(scene_ids, minlength=n_scenes)
+        sums = np.bincount(scene_ids, weights=scores, minlength=n_scenes)
+        has_values = counts > 0
+        means[has_values] = sums[has_values] / counts[has_values]
+        return best, means
+
+    # ---- 거의 같은 프레임 ----
+
+    def has_hashes(self):
+        return 'dhash' in self.metrics
+
+    def duplicate_groups(self, radius=DEFAULT_DUPLICATE_RADIUS):
+        """dHash 기준 거의 같은 프레임끼리 같은 묶음 번호 (미분석 프레임은 -1)"""
+        groups = self._duplicate_groups.get(radius)
+        if groups is None:
+            if self.has_hashes():
+                groups = group_near_duplicates(self.metrics['dhash'], ~np.isnan(self.sharpness), radius)
+            else:
+                groups = np.full(len(self), -1, dtype=np.int64)
+            self._duplicate_groups[radius] = groups
+        return groups
@@ -0,0 +1,1449 @@
+import os
+import sys
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap, QDragEnterEvent, QDropEvent, QFont
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                             QHBoxLayout, QPushButton, QSlider, QLabel, QCheckBox, QComboBox,
+                             QFileDialog, QMessageBox, QScrollArea, QSplitter, QListView, QTabWidget,
+                             QDialog, QDialogButtonBox, QFormLayout, QSpinBox, QDoubleSpinBox,
+                             QAbstractItemView)
+
+from analysis_cache import AnalysisCache
+from analyzer import (AnalysisCancelled, AnalysisFailed, AnalysisOptions, analyze_sharpness_parallel,
+                      analyze_sharpness_progressive, cache_variant as analysis_cache_variant, probe_frame_table)
+from exporter import DEFAULT_EXPORT_PROFILE, EXPORT_PROFILES, export_frames, read_frame_list, save_webp
+from frame_reader import FrameReader, PrefetchDecoder
+from hash_index import DEFAULT_DUPLICATE_RADIUS, drop_near_duplicates, hamming_distance
+from metrics import dhash
+from selection import frames_for_seconds, select_best_frames
+from stats_model import FrameStatsModel, frame_section, text_section
+from tracing import TRACER, span, traced
+from version import VERSION
+from worker_pool import WorkerPool
+
+
+# 분석 중 선명도 목록을 다시 그리는 최소 간격 (초)
+STATS_REFRESH_INTERVAL = 2.0
+# 이 환경 변수가 1 이거나 --trace 로 실행하면 단계별 시간 기록 (기본은 꺼 둠, 기록 비용이 있으므로)
+TRACE_ENV_VAR = 'VFE_TRACE'
+# 점진적 분석을 켜 두었을 때 이 프레임 수 이상인 비디오만 단계별로 분석 (짧은 비디오는 한 번에)
+PROGRESSIVE_MIN_FRAMES = 20000
+# 베스트 프레임 추출 기본값 (개수, 프레임 사이 최소 간격 초)
+DEFAULT_BEST_FRAME_COUNT = 20
+DEFAULT_BEST_FRAME_GAP = 2.0
+# 내보내기 설정 이름 (exporter.EXPORT_PROFILES 의 키) -> 표시 이름
+EXPORT_PROFILE_LABELS = {
+    'capture': 'WebP 384px (작은 파일)',
+    'fast': 'WebP 384px (빠름)',
+    'full': 'WebP 원본 크기',
+}
+
+# GUI 에서 고를 수 있는 선명도 분석 방식
+ANALYSIS_PRESETS = [
+    ('OpenCV 원본', AnalysisOptions()),
+    ('FFmpeg 흑백 원본', AnalysisOptions(backend='ffmpeg')),
+    ('FFmpeg 흑백 640px (빠름)', AnalysisOptions(backend='ffmpeg', analysis_width=640, low_precision=True)),
+]
+
+# Qt 5.14 이상은 BGR 배열을 색 변환 없이 그대로 QImage 로 사용 가능
+BGR_IMAGE_FORMAT = getattr(QImage, 'Format_BGR888', None)
+# 화면 크기에 맞춰 축소할 때 사용하는 보간법
+RENDER_INTERPOLATION = cv2.INTER_AREA
+
+
+class AnalysisThread(QThread):
+    """ffprobe + 선명도 분석을 GUI 스레드 밖에서 실행하고 단계별로 결과 전달"""
+    probe_progress = pyqtSignal(int)
+    table_ready = pyqtSignal(object)
+    # (분석한 프레임 수, 전체, 초당 프레임 수, 남은 시간 초), 점진적 분석이면 단계마다 새로 셈
+    sharpness_progress = pyqtSignal(int, int, float, float)
+    # 점진적 분석 단계 시작 (단계, 전체 단계 수, 이름)
+    level_started = pyqtSignal(int, int, str)
+    analysis_finished = pyqtSignal(object)
+    analysis_failed = pyqtSignal(str)
+
+    def __init__(self, video_path, probe_mode, expected_frames, options=None, pool=None, progressive=False):
+        super().__init__()
+        self.video_path = video_path
+        self.probe_mode = probe_mode
+        self.expected_frames = expected_frames
+        self.options = options
+        self.pool = pool
+        self.progressive = progressive
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            frame_table = probe_frame_table(self.video_path, self.probe_mode, self.expected_frames,
+                                            on_probe_progress=self.probe_progress.emit,
+                                            cancel_event=self.cancel_event)
+            self.table_ready.emit(frame_table)
+
+            print("[INFO] 선명도 병렬 분석 시작...")
+            start_time = time.monotonic()
+
+            def on_progress(analyzed, total):
+                elapsed = time.monotonic() - start_time
+                fps = analyzed / elapsed if elapsed > 0 else 0.0
+                eta = (total - analyzed) / fps if fps > 0 else -1.0
+                self.sharpness_progress.emit(analyzed, total, fps, eta)
+
+            def on_level(level, level_count, name):
+                nonlocal start_time
+                start_time = time.monotonic()
+                self.level_started.emit(level, level_count, name)
+
+            if self.progressive:
+                analyze_sharpness_progressive(self.video_path, frame_table, self.options, on_progress=on_progress,
+                                              on_level=on_level, cancel_event=self.cancel_event, pool=self.pool)
+            else:
+                analyze_sharpness_parallel(self.video_path, frame_table, self.options,
+                                           on_progress=on_progress, cancel_event=self.cancel_event, pool=self.pool)
+            self.analysis_finished.emit(frame_table)
+
+        except AnalysisCancelled:
+            print(f"[INFO] 분석 취소됨: {self.video_path}")
+
+        except AnalysisFailed as e:
+            # 일부 결과는 frame_table 에 남아 있지만 완전하지 않으므로 analysis_finished (캐시 저장) 를 보내지 않음
+            print(f"[ERROR] 선명도 분석 미완료: {e}")
+            self.analysis_failed.emit(str(e))
+
+        except Exception as e:
+            print(f"[ERROR] 분석 실패: {e}")
+            self.analysis_failed.emit(str(e))
+
+
+class ExportThread(QThread):
+    """선택한 프레임들을 GUI 스레드 밖에서 디코딩해서 파일로 저장"""
+    export_progress = pyqtSignal(int, int)
+    export_finished = pyqtSignal(object)
+
+    def __init__(self, video_path, frame_indices, output_dir, prefix, key_frames=None, profile=None):
+        super().__init__()
+        self.video_path = video_path
+        self.frame_indices = frame_indices
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.key_frames = key_frames
+        self.profile = profile
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            saved, failed = export_frames(self.video_path, self.frame_indices, self.output_dir, self.prefix,
+                                          key_frames=self.key_frames, profile=self.profile,
+                                          on_progress=self.export_progress.emit,
+                                          cancel_event=self.cancel_event)
+        except Exception as e:
+            print(f"[ERROR] 프레임 내보내기 실패: {e}")
+            saved, failed = [], list(self.frame_indices)
+        self.export_finished.emit((saved, failed))
+
+
+class BestFrameDialog(QDialog):
+    """베스트 프레임 추출 설정 (개수, 최소 간격, 참조 프레임 우대)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('베스트 프레임 추출')
+
+        self.count_spin = QSpinBox()
+        self.count_spin.setRange(1, 10000)
+        self.count_spin.setValue(DEFAULT_BEST_FRAME_COUNT)
+
+        self.gap_spin = QDoubleSpinBox()
+        self.gap_spin.setRange(0.0, 3600.0)
+        self.gap_spin.setDecimals(1)
+        self.gap_spin.setSuffix(' 초')
+        self.gap_spin.setValue(DEFAULT_BEST_FRAME_GAP)
+
+        self.reference_checkbox = QCheckBox('참조/I 프레임 우선')
+        self.per_scene_checkbox = QCheckBox('장면마다 하나씩')
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QFormLayout(self)
+        layout.addRow('프레임 수', self.count_spin)
+        layout.addRow('최소 간격', self.gap_spin)
+        layout.addRow(self.reference_checkbox)
+        layout.addRow(self.per_scene_checkbox)
+        layout.addRow(buttons)
+
+
+class FrameRequestScheduler(QObject):
+    """프레임 표시 요청을 가장 최근 것 하나로 합쳐서 백그라운드에서 디코딩
+
+    슬라이더를 끄는 동안 쌓이는 중간 값들은 모두 덮어써지고, 디코딩 중인
+    요청도 새 요청이 오면 중간에 포기함. exact=False 요청은 가장 가까운
+    키프레임만 디코딩해서 빠른 미리보기로 사용
+    """
+    # (요청한 프레임, 실제로 디코딩한 프레임, BGR 배열, 정확한 프레임인지)
+    frame_ready = pyqtSignal(int, int, object, bool)
+
+    def __init__(self, frame_reader, prefetcher=None, parent=None):
+        super().__init__(parent)
+        self.frame_reader = frame_reader
+        self.prefetcher = prefetcher
+        self.condition = threading.Condition()
+        self.pending = None
+        self.generation = 0
+        self.stopped = False
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def request(self, frame_number, exact=True):
+        with self.condition:
+            if self.pending == (frame_number, exact):
+                return
+            # 대기 중이거나 디코딩 중인 이전 요청은 모두 무효화
+            self.generation += 1
+            self.pending = (frame_number, exact)
+            self.condition.notify()
+
+    def cancel_pending(self):
+        with self.condition:
+            self.generation += 1
+            self.pending = None
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.stopped and self.pending is None:
+                    self.condition.wait()
+                if self.stopped:
+                    break
+                frame_number, exact = self.pending
+                self.pending = None
+                generation = self.generation
+
+            def superseded():
+                return self.generation != generation
+
+            with span('frame_request', 'display', frame=frame_number, exact=exact):
+                if exact:
+                    shown = frame_number
+                    frame = self.prefetcher.get(frame_number) if self.prefetcher else None
+                    if frame is None:
+                        frame = self.frame_reader.read(frame_number, cancel=superseded)
+                else:
+                    key_frame = self.frame_reader.keyframe_before(frame_number)
+                    shown = frame_number if key_frame is None else key_frame
+                    frame = self.frame_reader.read(shown, cancel=superseded)
+
+            if frame is not None and not superseded():
+                self.frame_ready.emit(frame_number, shown, frame, exact)
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.generation += 1
+            self.pending = None
+            self.condition.notify()
+        self.thread.join()
+
+
+class VideoFrameExtractor(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.frame_reader = None
+        self.prefetcher = None
+        self.frame_scheduler = None
+        # 화면에 표시 중인 (프레임 번호, 정확한 프레임인지)
+        self.displayed_frame = None
+        self.current_frame = None
+        # 화면에 그려진 BGR 프레임 (창 크기가 바뀌면 다시 축소해서 그림)
+        self.displayed_image = None
+        # 프레임마다 새로 할당하지 않도록 재사용하는 렌더링 버퍼
+        self.render_buffer = None
+        self.rgb_buffer = None
+        self.total_frames = 0
+        self.fps = 0
+        self.video_path = None
+        self.frame_table = None
+        self.avg_sizes = {}
+        self.analysis_cache = AnalysisCache()
+        self.analysis_thread = None
+        # 취소했지만 아직 끝나지 않은 분석 스레드 (끝날 때까지 참조를 유지, 종료할 때만 기다림)
+        self.cancelled_threads = set()
+        # 점진적 분석 중이면 현재 단계 표시 문자열 (예: '1/3 키프레임 표본')
+        self.analysis_level_text = ''
+        # 비디오를 바꿔도 계속 재사용하는 분석 프로세스 풀 (처음 분석할 때 시작)
+        self.worker_pool = WorkerPool()
+        self.last_stats_refresh = 0.0
+        # 'fast': 패킷 정보만 사용 (디코딩 없음), 'full': 프레임 디코딩으로 I/P/B 타입까지 분석
+        # 타입별 목록/참조 프레임/비트스트림 점수가 실제 픽처 타입을 쓰므로 기본은 'full'
+        self.probe_mode = 'full'
+        # 선명도 분석 방식 (ANALYSIS_PRESETS 중 하나)
+        self.analysis_options = ANALYSIS_PRESETS[0][1]
+        self.export_thread = None
+        # 이번 실행에서 캡처한 프레임의 dHash (같은 화면을 여러 번 저장하는 것 방지)
+        self.captured_hashes = np.empty(0, dtype=np.uint64)
+
+        self.init_ui()
+        self.setFocusPolicy(Qt.StrongFocus)
+
+    def init_ui(self):
+        self.setWindowTitle('비디오 프레임 추출기')
+        self.setGeometry(100, 100, 1800, 800)
+
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        main_layout = QHBoxLayout(main_widget)
+
+        splitter = QSplitter(Qt.Horizontal)
+
+        # 왼쪽: 비디오 영역
+        left_widget = QWidget()
+        layout = QVBoxLayout(left_widget)
+
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(False)
+        self.scroll_area.setAlignment(Qt.AlignCenter)
+
+        self.video_label = QLabel('비디오 파일을 여기에 드래그하세요')
+        self.video_label.setAlignment(Qt.AlignCenter)
+        self.video_label.setMinimumSize(800, 600)
+        self.video_label.setStyleSheet("""
+            QLabel {
+                border: 3px dashed #aaa;
+                background-color: #f0f0f0;
+                font-size: 18px;
+                color: #666;
+            }
+        """)
+        self.video_label.setScaledContents(False)
+
+        self.scroll_area.setWidget(self.video_label)
+        layout.addWidget(self.scroll_area)
+
+        self.time_label = QLabel('00:00:00.000 / 00:00:00.000')
+        self.time_label.setAlignment(Qt.AlignCenter)
+        self.time_label.setStyleSheet("font-size: 14px; padding: 5px;")
+        layout.addWidget(self.time_label)
+
+        self.timeline_slider = QSlider(Qt.Horizontal)
+        self.timeline_slider.setMinimum(0)
+        self.timeline_slider.setMaximum(0)
+        self.timeline_slider.setEnabled(False)
+        self.timeline_slider.valueChanged.connect(self.on_slider_change)
+        self.timeline_slider.sliderReleased.connect(self.on_slider_released)
+        layout.addWidget(self.timeline_slider)
+
+        control_layout = QHBoxLayout()
+
+        self.open_button = QPushButton('파일 열기')
+        self.open_button.clicked.connect(self.open_file)
+        control_layout.addWidget(self.open_button)
+
+        self.capture_button = QPushButton('캡처 (PNG 저장)')
+        self.capture_button.setEnabled(False)
+        self.capture_button.clicked.connect(self.capture_frame)
+        self.capture_button.setStyleSheet("""
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                font-size: 14px;
+                padding: 10px;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #45a049;
+            }
+            QPushButton:disabled {
+                background-color: #cccccc;
+                color: #666666;
+            }
+        """)
+        control_layout.addWidget(self.capture_button)
+
+        self.reanalyze_button = QPushButton('재분석')
+        self.reanalyze_button.setEnabled(False)
+        self.reanalyze_button.setToolTip('캐시를 지우고 현재 비디오를 다시 분석합니다')
+        self.reanalyze_button.clicked.connect(self.reanalyze_video)
+        control_layout.addWidget(self.reanalyze_button)
+
+        self.best_button = QPushButton('베스트 프레임 추출')
+        self.best_button.setEnabled(False)
+        self.best_button.setToolTip('선명한 프레임을 시간 간격을 두고 자동으로 골라 저장합니다')
+        self.best_button.clicked.connect(self.extract_best_frames)
+        control_layout.addWidget(self.best_button)
+
+        self.export_selected_button = QPushButton('선택 프레임 내보내기')
+        self.export_selected_button.setEnabled(False)
+        self.export_selected_button.setToolTip('현재 탭에서 선택한 프레임들을 한 번에 저장합니다 (Shift/Ctrl 로 여러 개 선택)')
+        self.export_selected_button.clicked.connect(self.export_selected_frames)
+        control_layout.addWidget(self.export_selected_button)
+
+        self.export_file_button = QPushButton('목록 파일로 내보내기')
+        self.export_file_button.setEnabled(False)
+        self.export_file_button.setToolTip('프레임 번호가 적힌 텍스트 파일을 읽어 해당 프레임들을 저장합니다')
+        self.export_file_button.clicked.connect(self.export_frames_from_file)
+        control_layout.addWidget(self.export_file_button)
+
+        self.export_profile_combo = QComboBox()
+        for name in EXPORT_PROFILES:
+            self.export_profile_combo.addItem(EXPORT_PROFILE_LABELS.get(name, name), name)
+        self.export_profile_combo.setCurrentIndex(list(EXPORT_PROFILES).index(DEFAULT_EXPORT_PROFILE))
+        self.export_profile_combo.setToolTip('여러 프레임을 내보낼 때 사용할 저장 설정')
+        control_layout.addWidget(self.export_profile_combo)
+
+        self.fast_probe_checkbox = QCheckBox('빠른 분석 (패킷 기준)')
+        self.fast_probe_checkbox.setChecked(self.probe_mode == 'fast')
+        self.fast_probe_checkbox.setToolTip('디코딩 없이 패킷 정보만 읽어 빠르게 분석합니다 '
+                                            '(키프레임 외에는 타입을 알 수 없어 P/B 목록과 참조 프레임 탐지가 비게 됨)')
+        self.fast_probe_checkbox.toggled.connect(self.on_probe_mode_toggled)
+        control_layout.addWidget(self.fast_probe_checkbox)
+
+        self.analysis_preset_combo = QComboBox()
+        for name, _ in ANALYSIS_PRESETS:
+            self.analysis_preset_combo.addItem(name)
+        self.analysis_preset_combo.setToolTip('선명도 분석에 사용할 디코딩 방식과 해상도를 선택합니다')
+        self.analysis_preset_combo.currentIndexChanged.connect(self.on_analysis_preset_changed)
+        control_layout.addWidget(self.analysis_preset_combo)
+
+        self.progressive_checkbox = QCheckBox('점진적 분석')
+        self.progressive_checkbox.setChecked(True)
+        self.progressive_checkbox.setToolTip(f'{PROGRESSIVE_MIN_FRAMES}프레임 이상인 긴 비디오는 키프레임 표본 -> '
+                                             '상위 표본 주변 -> 전체 순서로 분석해서 대략적인 순위를 먼저 보여줍니다')
+        control_layout.addWidget(self.progressive_checkbox)
+
+        self.group_duplicates_checkbox = QCheckBox('비슷한 프레임 묶기')
+        self.group_duplicates_checkbox.setToolTip('선명도 목록에서 거의 같은 프레임은 가장 선명한 하나만 표시합니다')
+        self.group_duplicates_checkbox.toggled.connect(self.on_group_duplicates_toggled)
+        control_layout.addWidget(self.group_duplicates_checkbox)
+
+        self.dedupe_export_checkbox = QCheckBox('내보낼 때 중복 제외')
+        self.dedupe_export_checkbox.setChecked(True)
+        self.dedupe_export_checkbox.setToolTip('여러 프레임을 저장할 때 거의 같은 프레임은 가장 선명한 하나만 저장합니다')
+        control_layout.addWidget(self.dedupe_export_checkbox)
+
+        self.full_resolution_checkbox = QCheckBox('원본 크기로 보기')
+        self.full_resolution_checkbox.setToolTip('해제하면 화면 크기에 맞춰 축소해서 표시합니다')
+        self.full_resolution_checkbox.toggled.connect(self.on_full_resolution_toggled)
+        control_layout.addWidget(self.full_resolution_checkbox)
+
+        self.trace_button = QPushButton('트레이스 저장')
+        self.trace_button.setToolTip('지금까지 기록된 단계별 시간을 Chrome 트레이스 JSON 으로 저장합니다 '
+                                     '(chrome://tracing, Perfetto 에서 열기)')
+        self.trace_button.clicked.connect(self.save_trace)
+        # 추적을 켜고 실행했을 때만 표시
+        self.trace_button.setVisible(TRACER.enabled)
+        control_layout.addWidget(self.trace_button)
+
+        layout.addLayout(control_layout)
+
+        # 오른쪽: 통계 영역
+        right_widget = QWidget()
+        right_layout = QVBoxLayout(right_widget)
+
+        self.tab_widget = QTabWidget()
+
+        self.size_model = FrameStatsModel(self)
+        self.size_list = QListView()
+        self.setup_list_view(self.size_list, self.size_model)
+        self.tab_widget.addTab(self.size_list, "📦 용량 기준")
+
+        self.sharpness_model = FrameStatsModel(self)
+        self.sharpness_list = QListView()
+        self.setup_list_view(self.sharpness_list, self.sharpness_model)
+        self.tab_widget.addTab(self.sharpness_list, "🔍 선명도 기준")
+
+        self.reference_model = FrameStatsModel(self)
+        self.reference_list = QListView()
+        self.setup_list_view(self.reference_list, self.reference_model)
+        self.tab_widget.addTab(self.reference_list, "🎯 참조 프레임")
+
+        self.best_model = FrameStatsModel(self)
+        self.best_list = QListView()
+        self.setup_list_view(self.best_list, self.best_model)
+        self.tab_widget.addTab(self.best_list, "🏆 베스트")
+
+        self.scene_model = FrameStatsModel(self)
+        self.scene_list = QListView()
+        self.setup_list_view(self.scene_list, self.scene_model)
+        self.tab_widget.addTab(self.scene_list, "🎬 장면")
+
+        right_layout.addWidget(self.tab_widget)
+
+        splitter.addWidget(left_widget)
+        splitter.addWidget(right_widget)
+        splitter.setStretchFactor(0, 2)
+        splitter.setStretchFactor(1, 1)
+
+        main_layout.addWidget(splitter)
+
+        self.setAcceptDrops(True)
+
+    def setup_list_view(self, list_view, model):
+        list_view.setMinimumWidth(450)
+        font = QFont("SF Mono")
+        font.setStyleHint(QFont.TypeWriter)
+        font.setPointSize(10)
+        list_view.setFont(font)
+        # 모든 행 높이가 같다고 알려서 보이는 행만 측정/그리기
+        list_view.setUniformItemSizes(True)
+        list_view.setModel(model)
+        list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        list_view.setStyleSheet("""
+            QListView {
+                background-color: #1e1e1e;
+                border: 1px solid #444;
+                padding: 5px;
+                color: #e0e0e0;
+            }
+            QListView::item {
+                padding: 3px;
+                border-bottom: 1px solid #333;
+            }
+            QListView::item:hover {
+                background-color: #2d2d2d;
+            }
+            QListView::item:selected {
+                background-color: #0d47a1;
+                color: white;
+            }
+        """)
+        list_view.clicked.connect(self.on_stats_item_clicked)
+        list_view.selectionModel().currentChanged.connect(self.on_stats_item_changed)
+
+    def title_font(self):
+        # 행 높이를 통일하므로 제목도 목록과 같은 크기에 굵게만 표시
+        font = QFont("SF Mono", 10, QFont.Bold)
+        font.setStyleHint(QFont.TypeWriter)
+        return font
+
+    def dragEnterEvent(self, event: QDragEnterEvent):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event: QDropEvent):
+        files = [u.toLocalFile() for u in event.mimeData().urls()]
+        if files:
+            video_file = files[0]
+            if video_file.lower().endswith(('.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv')):
+                self.load_video(video_file)
+            else:
+                QMessageBox.warning(self, '오류', '지원하는 비디오 파일이 아닙니다.')
+
+    def open_file(self):
+        file_name, _ = QFileDialog.getOpenFileName(
+            self, '비디오 파일 선택', '',
+            'Video Files (*.mp4 *.avi *.mov *.mkv *.flv *.wmv)'
+        )
+        if file_name:
+            self.load_video(file_name)
+
+    def format_time_short(self, frame_number):
+        if self.fps == 0:
+            return "00:00.000"
+        seconds = frame_number / self.fps
+        minutes = int(seconds // 60)
+        secs = seconds % 60
+        return f'{minutes:02d}:{secs:06.3f}'
+
+    def on_stats_item_clicked(self, item):
+        self.go_to_frame(item.data(Qt.UserRole))
+
+    def on_stats_item_changed(self, current, previous):
+        if current.isValid():
+            self.go_to_frame(current.data(Qt.UserRole))
+
+    def go_to_frame(self, frame_number):
+        # 한 번 클릭하면 clicked / currentChanged 가 모두 오므로 같은 이동은 한 번만 처리
+        if frame_number is None or frame_number == self.timeline_slider.value():
+            return
+
+        print(f"[INFO] 프레임 {frame_number}로 이동 ({self.format_time_short(frame_number)})")
+        self.timeline_slider.setValue(frame_number)
+
+    @traced('update_reference_stats', 'stats')
+    def update_reference_stats(self):
+        if not self.frame_table:
+            self.reference_model.set_sections([text_section("프레임 분석 데이터가 없습니다.")])
+            return
+
+        table = self.frame_table
+        ref_frames = np.flatnonzero(table.is_reference)
+
+        self.reference_model.set_sections([
+            text_section("=" * 65),
+            text_section(f"참조 프레임 목록 (총 {len(ref_frames)}개)", self.title_font()),
+            text_section("(다른 프레임의 기점이 되는 프레임)"),
+            text_section("=" * 65),
+            text_section(""),
+            frame_section(ref_frames, partial(self._format_reference_row, table))
+        ])
+
+    def _format_reference_row(self, table, rank, idx):
+        ftype = table.frame_type(idx)
+        size = int(table.size[idx])
+        quality = table.quality_at(idx)
+
+        size_kb = size / 1024
+        time_str = self.format_time_short(idx)
+
+        ratio = table.size_ratio(idx)
+
+        if ftype == 'I':
+            emoji = '⭐🟢'
+        elif ftype == 'P':
+            emoji = '⭐🔵'
+        elif ftype == 'B':
+            emoji = '⭐🟠'
+        else:
+            emoji = '⭐⚪'
+
+        if quality is not None:
+            return f"  {rank:4d}. {time_str} | {emoji}{ftype} {size_kb:8.4f}KB ({ratio:6.2f}%) QP:{quality}"
+        return f"  {rank:4d}. {time_str} | {emoji}{ftype} {size_kb:8.4f}KB ({ratio:6.2f}%)"
+
+    @traced('update_size_stats', 'stats')
+    def update_size_stats(self):
+        if not self.frame_table:
+            self.size_model.set_sections([text_section("프레임 분석 데이터가 없습니다.")])
+            return
+
+        table = self.frame_table
+
+        sections = [
+            text_section("=" * 65),
+            text_section("전체 프레임 TOP 15 (용량 기준)", self.title_font()),
+            text_section("=" * 65),
+            frame_section(table.top_k('size', 15), partial(self._format_size_row, table))
+        ]
+        sections.extend(self._type_based_sections(table))
+
+        self.size_model.set_sections(sections)
+
+    def _format_size_row(self, table, rank, idx):
+        ftype = table.frame_type(idx)
+        size = int(table.size[idx])
+        quality = table.quality_at(idx)
+        is_ref = bool(table.is_reference[idx])
+
+        size_kb = size / 1024
+        time_str = self.format_time_short(idx)
+
+        if is_ref:
+            emoji = {'I': '⭐🟢', 'P': '⭐🔵', 'B': '⭐🟠'}.get(ftype, '⭐⚪')
+        else:
+            emoji = {'I': '🟢', 'P': '🔵', 'B': '🟠'}.get(ftype, '⚪')
+
+        if quality is not None:
+            return f"  {rank:2d}. {time_str} | {emoji}{ftype} {size_kb:10.4f}KB QP:{quality}"
+        return f"  {rank:2d}. {time_str} | {emoji}{ftype} {size_kb:10.4f}KB"
+
+    @traced('update_sharpness_stats', 'stats')
+    def update_sharpness_stats(self):
+        analyzed = self.frame_table.analyzed_indices() if self.frame_table else []
+
+        # 장면별 통계도 선명도 값에 따라 바뀌므로 함께 갱신
+        self.update_scene_stats()
+
+        if len(analyzed) == 0:
+            self.sharpness_model.set_sections([text_section("선명도 분석 데이터가 없습니다.")])
+            return
+
+        table = self.frame_table
+        ranked = table.rank('sharpness', analyzed)
+
+        # 분석 중에는 묶음이 계속 바뀌므로 끝난 뒤에만 묶어서 표시
+        if self.group_duplicates_checkbox.isChecked() and table.has_hashes() and self.analysis_thread is None:
+            groups = table.duplicate_groups()
+            group_sizes = np.bincount(groups[groups >= 0])
+            # 선명도 순으로 정렬된 상태에서 묶음마다 처음 나오는 프레임 = 묶음에서 가장 선명한 프레임
+            _, first = np.unique(groups[ranked], return_index=True)
+            ranked = ranked[np.sort(first)]
+
+            self.sharpness_model.set_sections([
+                text_section("=" * 65),
+                text_section(f"선명도 순위 (비슷한 프레임 {len(group_sizes)}묶음)", self.title_font()),
+                text_section("(묶음마다 가장 선명한 프레임만 표시)"),
+                text_section("=" * 65),
+                text_section(""),
+                frame_section(ranked, partial(self._format_grouped_row, table, groups, group_sizes))
+            ])
+            return
+
+        self.sharpness_model.set_sections([
+            text_section("=" * 65),
+            text_section("전체 프레임 선명도 순위", self.title_font()),
+            text_section("(높을수록 선명함)"),
+            text_section("=" * 65),
+            text_section(""),
+            frame_section(ranked, partial(self._format_sharpness_row, table))
+        ])
+
+    def on_group_duplicates_toggled(self, checked):
+        self.update_sharpness_stats()
+
+    def _format_grouped_row(self, table, groups, group_sizes, rank, idx):
+        row = self._format_sharpness_row(table, rank, idx)
+        size = int(group_sizes[groups[idx]])
+        return f"{row} [묶음 {groups[idx] + 1}: {size}장]" if size > 1 else row
+
+    @traced('update_scene_stats', 'stats')
+    def update_scene_stats(self):
+        if not self.frame_table or 'scene_diff' not in self.frame_table.metrics:
+            self.scene_model.set_sections([text_section("장면 분석 데이터가 없습니다.")])
+            return
+
+        # 분석 스레드가 같은 열에 쓰는 중에는 장면을 나누지 않음 (끝나면 분석 스레드가 경계까지 반영해서 계산)
+        if self.analysis_thread is not None:
+            self.scene_model.set_sections([text_section("장면 분석 중...")])
+            return
+
+        table = self.frame_table
+        best, means = table.scene_stats()
+
+        self.scene_model.set_sections([
+            text_section("=" * 65),
+            text_section(f"장면 목록 (총 {len(table.scene_cuts)}개)", self.title_font()),
+            text_section("(PageUp/PageDown 으로 이전/다음 장면 이동)"),
+            text_section("=" * 65),
+            text_section(""),
+            frame_section(table.scene_cuts, partial(self._format_scene_row, table, table.scene_lengths(),
+                                                    best, means))
+        ])
+
+    def _format_scene_row(self, table, lengths, best, means, rank, idx):
+        scene = rank - 1
+        length = int(lengths[scene])
+        duration = length / self.fps if self.fps > 0 else 0
+        row = f"  {rank:4d}. {self.format_time_short(idx)} | {length:6d}프레임 ({duration:6.1f}초)"
+
+        if best[scene] >= 0:
+            row += f" 평균 선명:{means[scene]:8.2f} 최고:{self.format_time_short(int(best[scene]))}"
+        return row
+
+    def go_to_scene(self, forward):
+        if not self.frame_table or len(self.frame_table.scene_cuts) == 0:
+            return
+
+        current = self.timeline_slider.value()
+        if forward:
+            target = self.frame_table.next_scene_start(current)
+        else:
+            target = self.frame_table.previous_scene_start(current)
+
+        if target is None:
+            return
+
+        scene = self.frame_table.scene_of(target)
+        self.statusBar().showMessage(f'장면 {scene + 1}/{len(self.frame_table.scene_cuts)}', 1500)
+        self.timeline_slider.setValue(target)
+
+    def _format_sharpness_row(self, table, rank, idx):
+        sharpness = table.sharpness[idx]
+        time_str = self.format_time_short(idx)
+
+        ftype = table.frame_type(idx)
+        size = int(table.size[idx])
+        size_kb = size / 1024
+        is_ref = bool(table.is_reference[idx])
+
+        ratio = table.size_ratio(idx)
+
+        if is_ref:
+            emoji = {'I': '⭐🟢', 'P': '⭐🔵', 'B': '⭐🟠'}.get(ftype, '⭐⚪')
+        else:
+            emoji = {'I': '🟢', 'P': '🔵', 'B': '🟠'}.get(ftype, '⚪')
+
+        row = f"  {rank:4d}. {time_str} | {emoji}{ftype} 선명:{sharpness:8.4f} {size_kb:8.4f}KB ({ratio:6.2f}%)"
+
+        # 함께 계산된 지표가 있으면 뒤에 표시
+        brightness = table.metric_at('brightness', idx)
+        if brightness is not None:
+            row += f" 밝기:{brightness:5.1f}"
+        noise = table.metric_at('noise', idx)
+        if noise is not None:
+            row += f" 노이즈:{noise:5.2f}"
+        return row
+
+    def extract_best_frames(self):
+        """선명도 상위 프레임을 최소 간격을 두고 골라서 베스트 탭에 표시하고 저장"""
+        if not self.frame_table or len(self.frame_table.analyzed_indices()) == 0:
+            return
+        if self.export_thread is not None:
+            QMessageBox.information(self, '알림', '이전 내보내기가 아직 진행 중입니다.')
+            return
+
+        dialog = BestFrameDialog(self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+
+        table = self.frame_table
+        min_gap = frames_for_seconds(table, dialog.gap_spin.value())
+        start = time.perf_counter()
+        best = select_best_frames(table, dialog.count_spin.value(), min_gap=min_gap,
+                                  boundaries=table.scene_cuts if dialog.per_scene_checkbox.isChecked() else None,
+                                  prefer_reference=dialog.reference_checkbox.isChecked())
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"[INFO] 베스트 프레임 {len(best)}개 선택 ({elapsed_ms:.1f}ms, 최소 간격 {min_gap}프레임)")
+
+        self.best_model.set_sections([
+            text_section("=" * 65),
+            text_section(f"베스트 프레임 (총 {len(best)}개)", self.title_font()),
+            text_section(f"(선명도 순, 최소 {dialog.gap_spin.value():.1f}초 간격)"),
+            text_section("=" * 65),
+            text_section(""),
+            frame_section(best, partial(self._format_sharpness_row, table))
+        ])
+        self.tab_widget.setCurrentWidget(self.best_list)
+
+        if len(best) == 0:
+            return
+
+        self.start_export(best, '베스트 프레임 저장 폴더')
+
+    def export_selected_frames(self):
+        """현재 탭에서 선택한 행들의 프레임을 저장"""
+        list_view = self.tab_widget.currentWidget()
+        selected = [index.data(Qt.UserRole) for index in list_view.selectionModel().selectedIndexes()]
+        frame_indices = [idx for idx in selected if idx is not None]
+
+        if not frame_indices:
+            QMessageBox.information(self, '알림', '내보낼 프레임을 목록에서 선택하세요.')
+            return
+
+        self.start_export(frame_indices, '선택 프레임 저장 폴더')
+
+    def export_frames_from_file(self):
+        """프레임 번호 목록 파일을 읽어서 해당 프레임들을 저장"""
+        list_path, _ = QFileDialog.getOpenFileName(
+            self, '프레임 목록 파일', '', 'Text Files (*.txt *.csv);;All Files (*)'
+        )
+        if not list_path:
+            return
+
+        try:
+            frame_indices = read_frame_list(list_path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, '오류', f'목록 파일을 읽을 수 없습니다:\n{e}')
+            return
+
+        valid = [idx for idx in frame_indices if 0 <= idx < self.total_frames]
+        if len(valid) < len(frame_indices):
+            print(f"[WARN] 범위를 벗어난 프레임 번호 {len(frame_indices) - len(valid)}개 무시")
+        if not valid:
+            QMessageBox.information(self, '알림', '내보낼 프레임이 없습니다.')
+            return
+
+        self.start_export(valid, '목록 프레임 저장 폴더')
+
+    def start_export(self, frame_indices, dialog_title):
+        """저장 폴더를 고른 뒤 백그라운드에서 정렬 디코딩 + 병렬 인코딩으로 저장"""
+        if self.export_thread is not None:
+            QMessageBox.information(self, '알림', '이전 내보내기가 아직 진행 중입니다.')
+            return
+
+        project_dir = Path(__file__).parent / VERSION
+        project_dir.mkdir(exist_ok=True)
+        output_dir = QFileDialog.getExistingDirectory(self, dialog_title, str(project_dir))
+        if not output_dir:
+            return
+
+        table = self.frame_table
+        if self.dedupe_export_checkbox.isChecked() and table is not None and table.has_hashes():
+            # 선명한 프레임부터 남기도록 선명도 순으로 보면서 거의 같은 프레임 제외
+            frame_indices = np.asarray(frame_indices, dtype=np.int64)
+            analyzed = frame_indices[~np.isnan(table.sharpness[frame_indices])]
+            unanalyzed = frame_indices[np.isnan(table.sharpness[frame_indices])]
+            kept = drop_near_duplicates(table.rank('sharpness', analyzed), table.metrics['dhash'])
+            if len(kept) < len(analyzed):
+                print(f"[INFO] 거의 같은 프레임 {len(analyzed) - len(kept)}개 제외")
+            frame_indices = np.concatenate((kept, unanalyzed))
+
+        profile = EXPORT_PROFILES[self.export_profile_combo.currentData()]
+        print(f"[INFO] 프레임 {len(frame_indices)}개 내보내기 시작: {output_dir}")
+
+        thread = ExportThread(self.video_path, frame_indices, output_dir, Path(self.video_path).stem,
+                              key_frames=np.flatnonzero(self.frame_table.key_frame) if self.frame_table else None,
+                              profile=profile)
+        thread.export_progress.connect(self.on_export_progress)
+        thread.export_finished.connect(self.on_export_finished)
+        self.export_thread = thread
+        thread.start()
+
+    def cancel_export(self):
+        thread = self.export_thread
+        self.export_thread = None
+
+        if thread is not None and thread.isRunning():
+            thread.cancel()
+            thread.wait()
+
+    def on_export_progress(self, done, total):
+        if self.sender() is not self.export_thread:
+            return
+        self.statusBar().showMessage(f'프레임 저장 중... {done}/{total}', 0)
+
+    def on_export_finished(self, result):
+        if self.sender() is not self.export_thread:
+            return
+        self.export_thread = None
+        saved, failed = result
+        if not failed:
+            self.statusBar().showMessage(f'프레임 {len(saved)}개 저장 완료', 3000)
+            return
+
+        self.statusBar().showMessage(f'프레임 {len(saved)}개 저장, {len(failed)}개 실패', 0)
+        shown = ', '.join(str(idx) for idx in failed[:20])
+        if len(failed) > 20:
+            shown += ' ...'
+        QMessageBox.warning(self, '내보내기 실패', f'프레임 {len(failed)}개를 저장하지 못했습니다.\n{shown}')
+
+    def _type_based_sections(self, table):
+        # 타입별 상위 50개만 부분 정렬 (B 는 작은 순)
+        frames_by_type = {
+            'I': table.top_k('size', 50, table.indices_of_types(['I'])),
+            'P': table.top_k('size', 50, table.indices_of_types(['P'])),
+            'B': table.top_k('size', 50, table.indices_of_types(['B']), descending=False)
+        }
+
+        sections = [
+            text_section(""),
+            text_section(""),
+            text_section("=" * 65),
+            text_section("타입별 프레임 순위", self.title_font()),
+            text_section("=" * 65),
+            text_section("")
+        ]
+
+        for ftype, label, color_emoji, desc in [
+            ('I', 'I-FRAME', '🟢', '용량 큰 순'),
+            ('P', 'P-FRAME', '🔵', '용량 큰 순'),
+            ('B', 'B-FRAME', '🟠', '용량 작은 순 (원본에 가까움)')
+        ]:
+            frames = frames_by_type[ftype]
+
+            sections.append(text_section(f"{color_emoji} {label} TOP 50 ({desc})", self.title_font()))
+            sections.append(text_section("-" * 65))
+
+            if len(frames) == 0:
+                sections.append(text_section("  (없음)"))
+            else:
+                sections.append(frame_section(frames, partial(self._format_type_row, table, ftype)))
+
+            sections.append(text_section(""))
+
+        return sections
+
+    def _format_type_row(self, table, ftype, rank, idx):
+        size = int(table.size[idx])
+        quality = table.quality_at(idx)
+        is_ref = bool(table.is_reference[idx])
+
+        avg_size = table.avg_sizes.get(ftype, 1)
+        size_kb = size / 1024
+        ratio = (size / avg_size) * 100 if avg_size > 0 else 100
+        time_str = self.format_time_short(idx)
+
+        ref_mark = '⭐' if is_ref else '  '
+
+        if quality is not None:
+            return f"{ref_mark}{rank:2d}. {time_str} | {size_kb:10.4f}KB ({ratio:6.2f}%) QP:{quality}"
+        return f"{ref_mark}{rank:2d}. {time_str} | {size_kb:10.4f}KB ({ratio:6.2f}%)"
+
+    def load_video(self, video_path):
+        # 이전 비디오의 분석이 진행 중이면 취소 (작업 프로세스 풀은 그대로 재사용)
+        self.cancel_analysis()
+
+        self.stop_frame_decoding()
+        if self.frame_reader:
+            self.frame_reader.release()
+
+        self.video_path = video_path
+        self.displayed_frame = None
+        self.frame_reader = FrameReader(video_path)
+
+        if not self.frame_reader.is_opened():
+            QMessageBox.critical(self, '오류', '비디오를 열 수 없습니다.')
+            return
+
+        self.total_frames = int(self.frame_reader.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.fps = self.frame_reader.get(cv2.CAP_PROP_FPS)
+
+        # ±fps 점프까지는 방향 예측에 사용
+        self.prefetcher = PrefetchDecoder(video_path, total_frames=self.total_frames,
+                                          max_step=max(1, int(self.fps) if self.fps > 0 else 30))
+        self.prefetcher.start()
+
+        self.frame_scheduler = FrameRequestScheduler(self.frame_reader, self.prefetcher, self)
+        self.frame_scheduler.frame_ready.connect(self.on_frame_ready)
+
+        cached = self.analysis_cache.get(video_path, variant=self.cache_variant())
+
+        self.best_model.clear()
+
+        if cached is not None:
+            print("[INFO] 캐시된 분석 결과 사용")
+            self.set_frame_table(cached)
+            self.update_sharpness_stats()
+            self.best_button.setEnabled(True)
+            self.statusBar().showMessage('', 0)
+        else:
+            self.set_frame_table(None)
+            self.update_sharpness_stats()
+            self.best_button.setEnabled(False)
+            self.start_analysis(video_path)
+
+        # 분석이 끝나기 전에도 타임라인과 프레임 미리보기는 바로 사용 가능
+        self.timeline_slider.setMaximum(self.total_frames - 1)
+        self.timeline_slider.setEnabled(True)
+        self.timeline_slider.setValue(0)
+        self.capture_button.setEnabled(True)
+        self.reanalyze_button.setEnabled(True)
+        self.export_selected_button.setEnabled(True)
+        self.export_file_button.setEnabled(True)
+
+        self.show_frame(0)
+
+    def set_frame_table(self, frame_table):
+        self.frame_table = frame_table
+        self.avg_sizes = frame_table.avg_sizes if frame_table else {}
+
+        # 키프레임 위치를 알면 show_frame 이 해당 GOP 시작점으로 정확히 탐색
+        if frame_table and self.frame_reader:
+            key_frames = np.flatnonzero(frame_table.key_frame)
+            self.frame_reader.set_key_frames(key_frames)
+            if self.prefetcher:
+                self.prefetcher.set_key_frames(key_frames)
+
+        self.update_size_stats()
+        self.update_reference_stats()
+
+    def stop_frame_decoding(self):
+        if self.frame_scheduler:
+            self.frame_scheduler.stop()
+            self.frame_scheduler = None
+        if self.prefetcher:
+            self.prefetcher.stop()
+            self.prefetcher = None
+
+    def start_analysis(self, video_path):
+        self.statusBar().showMessage('프레임 분석 중...', 0)
+
+        # 처음 분석하는 경우 ffprobe 가 도는 동안 작업 프로세스를 미리 시작
+        self.worker_pool.warm_up()
+
+        progressive = self.progressive_checkbox.isChecked() and self.total_frames >= PROGRESSIVE_MIN_FRAMES
+        self.analysis_level_text = ''
+
+        thread = AnalysisThread(video_path, self.probe_mode, self.total_frames, self.analysis_options,
+                                self.worker_pool, progressive)
+        thread.probe_progress.connect(self.on_probe_progress)
+        thread.table_ready.connect(self.on_table_ready)
+        thread.level_started.connect(self.on_level_started)
+        thread.sharpness_progress.connect(self.on_sharpness_progress)
+        thread.analysis_finished.connect(self.on_analysis_finished)
+        thread.analysis_failed.connect(self.on_analysis_failed)
+
+        self.analysis_thread = thread
+        self.last_stats_refresh = time.monotonic()
+        thread.start()
+
+    def cancel_analysis(self):
+        thread = self.analysis_thread
+        self.analysis_thread = None
+
+        if thread is not None and thread.isRunning():
+            # GUI 스레드에서 기다리지 않음: 취소된 스레드는 곧 끝나고, 그 사이 도착한 시그널은 무시됨
+            thread.cancel()
+            self.cancelled_threads.add(thread)
+            thread.finished.connect(partial(self.cancelled_threads.discard, thread))
+
+    def _is_current_analysis(self):
+        # 취소된 이전 분석에서 늦게 도착한 시그널은 무시
+        return self.sender() is not None and self.sender() is self.analysis_thread
+
+    def on_probe_progress(self, count):
+        if self._is_current_analysis():
+            self.statusBar().showMessage(f'프레임 정보 수신 중... {count}개', 0)
+
+    def on_table_ready(self, frame_table):
+        if not self._is_current_analysis():
+            return
+
+        self.set_frame_table(frame_table)
+        self.update_frame_label(self.timeline_slider.value())
+        self.statusBar().showMessage('선명도 분석 중...', 0)
+
+    def on_level_started(self, level, level_count, name):
+        if not self._is_current_analysis():
+            return
+
+        self.analysis_level_text = f'{level}/{level_count}단계 {name}'
+        self.statusBar().showMessage(f'선명도 분석 중 ({self.analysis_level_text})...', 0)
+
+        # 이전 단계 결과로 순위 목록 갱신 (1단계 직후 대략적인 순위가 바로 보임)
+        if level > 1:
+            self.last_stats_refresh = time.monotonic()
+            self.update_sharpness_stats()
+
+    def on_sharpness_progress(self, analyzed, total, fps, eta):
+        if not self._is_current_analysis():
+            return
+
+        percent = analyzed / total * 100 if total else 100
+        eta_text = f', 남은 시간 약 {self.format_time(eta)[:8]}' if eta >= 0 else ''
+        level_text = f' ({self.analysis_level_text})' if self.analysis_level_text else ''
+        self.statusBar().showMessage(
+            f'선명도 분석 중{level_text}... {analyzed}/{total} ({percent:.1f}%, {fps:.0f} fps{eta_text})', 0)
+
+        # 목록 전체를 다시 그리는 비용이 있으므로 일정 간격으로만 갱신
+        now = time.monotonic()
+        if now - self.last_stats_refresh >= STATS_REFRESH_INTERVAL:
+            self.last_stats_refresh = now
+            self.update_sharpness_stats()
+
+    def on_analysis_finished(self, frame_table):
+        if not self._is_current_analysis():
+            return
+
+        self.analysis_thread = None
+        self.update_sharpness_stats()
+        self.best_button.setEnabled(True)
+        self.statusBar().showMessage('분석 완료', 3000)
+
+        # 모든 작업 단위가 끝난 경우에만 여기로 옴 (실패/일부만 분석되면 on_analysis_failed)
+        try:
+            self.analysis_cache.put(self.video_path, frame_table, variant=self.cache_variant())
+        except OSError as e:
+            print(f"[WARN] 캐시 저장 실패: {e}")
+
+    def on_analysis_failed(self, message):
+        if not self._is_current_analysis():
+            return
+
+        # 일부만 분석된 결과는 보여주되 캐시하지 않음 (다음에 열면 다시 분석)
+        self.analysis_thread = None
+        if self.frame_table is not None:
+            self.update_sharpness_stats()
+            self.best_button.setEnabled(len(self.frame_table.analyzed_indices()) > 0)
+        self.statusBar().showMessage(f'분석 실패: {message}', 0)
+
+    def reanalyze_video(self):
+        if not self.video_path:
+            return
+
+        removed = self.analysis_cache.invalidate(self.video_path)
+        print(f"[INFO] 캐시 항목 {removed}개 삭제 후 재분석")
+        self.load_video(self.video_path)
+
+    def on_probe_mode_toggled(self, checked):
+        self.probe_mode = 'fast' if checked else 'full'
+        if self.video_path:
+            self.load_video(self.video_path)
+
+    def on_analysis_preset_changed(self, index):
+        self.analysis_options = ANALYSIS_PRESETS[index][1]
+        if self.video_path:
+            self.load_video(self.video_path)
+
+    def cache_variant(self):
+        return analysis_cache_variant(self.probe_mode, self.analysis_options)
+
+    def show_frame(self, frame_number, exact=True):
+        """frame_number 표시 요청 (exact=False 면 가까운 키프레임으로 빠르게 미리보기)"""
+        if not self.frame_scheduler:
+            return
+
+        if self.displayed_frame == (frame_number, True) or self.displayed_frame == (frame_number, exact):
+            return
+
+        if exact:
+            # 미리 읽기 버퍼에 있으면 디코딩 스레드를 거치지 않고 바로 표시
+            frame = self.prefetcher.get(frame_number) if self.prefetcher else None
+            if frame is not None:
+                self.frame_scheduler.cancel_pending()
+                self.display_frame(frame_number, frame_number, frame, True)
+                return
+
+        self.frame_scheduler.request(frame_number, exact)
+
+    def on_frame_ready(self, frame_number, shown_number, frame, exact):
+        # 그 사이 다른 위치로 이동했으면 버림
+        if frame_number != self.timeline_slider.value():
+            return
+        self.display_frame(frame_number, shown_number, frame, exact)
+
+    def display_frame(self, frame_number, shown_number, frame, exact):
+        try:
+            self.displayed_frame = (frame_number, exact)
+
+            # 이동 방향/보폭을 알려서 다음 프레임들을 백그라운드에서 디코딩
+            if exact and self.prefetcher:
+                self.prefetcher.notify(frame_number)
+
+            if exact:
+                self.current_frame = frame
+
+            self.render_frame(frame)
+            self.update_frame_label(frame_number)
+
+            if not exact and shown_number != frame_number:
+                self.statusBar().showMessage(f'미리보기: 키프레임 {shown_number} (놓으면 정확한 프레임 표시)', 1000)
+
+        except Exception as e:
+            print(f"[ERROR] show_frame: {e}")
+            import traceback
+            traceback.print_exc()
+
+    def render_frame(self, frame):
+        """BGR 프레임을 화면에 그림 (기본은 보이는 영역 크기로 먼저 축소)"""
+        self.displayed_image = frame
+        h, w = frame.shape[:2]
+
+        with span('convert', 'display'):
+            if not self.full_resolution_checkbox.isChecked():
+                viewport = self.scroll_area.viewport().size()
+                scale = min(viewport.width() / w, viewport.height() / h, 1.0)
+
+                if scale < 1.0:
+                    w, h = max(1, int(w * scale)), max(1, int(h * scale))
+                    if self.render_buffer is None or self.render_buffer.shape[:2] != (h, w):
+                        self.render_buffer = np.empty((h, w, 3), dtype=np.uint8)
+                    frame = cv2.resize(frame, (w, h), dst=self.render_buffer, interpolation=RENDER_INTERPOLATION)
+
+            if BGR_IMAGE_FORMAT is not None:
+                qt_image = QImage(frame.data, w, h, frame.strides[0], BGR_IMAGE_FORMAT)
+            else:
+                if self.rgb_buffer is None or self.rgb_buffer.shape[:2] != (h, w):
+                    self.rgb_buffer = np.empty((h, w, 3), dtype=np.uint8)
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.rgb_buffer)
+                qt_image = QImage(frame_rgb.data, w, h, frame_rgb.strides[0], QImage.Format_RGB888)
+
+        # fromImage 에서 한 번 복사되므로 버퍼는 다음 프레임에서 다시 써도 안전
+        # (실제 화면 그리기는 이벤트 루프에서 나중에 일어나므로 여기서는 픽스맵 생성/설정까지만 기록)
+        with span('paint', 'display'):
+            pixmap = QPixmap.fromImage(qt_image)
+            self.video_label.setPixmap(pixmap)
+            self.video_label.resize(pixmap.size())
+
+    def on_full_resolution_toggled(self, checked):
+        if self.displayed_image is not None:
+            self.render_frame(self.displayed_image)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.displayed_image is not None and not self.full_resolution_checkbox.isChecked():
+            self.render_frame(self.displayed_image)
+
+    def update_frame_label(self, frame_number):
+        """시간 / 프레임 타입 정보 표시"""
+        frame_type = '?'
+        frame_size = 0
+        quality = None
+        is_reference = False
+        color = '#757575'
+
+        if self.frame_table and 0 <= frame_number < len(self.frame_table):
+            table = self.frame_table
+            frame_type = table.frame_type(frame_number)
+            frame_size = int(table.size[frame_number])
+            quality = table.quality_at(frame_number)
+            is_reference = bool(table.is_reference[frame_number])
+
+            avg_size = self.avg_sizes.get(frame_type, 1)
+            quality_ratio = (frame_size / avg_size) * 100 if avg_size > 0 else 100
+
+            if frame_type == 'I':
+                color = '#4CAF50'
+            elif frame_type == 'P':
+                color = '#2196F3'
+            elif frame_type == 'B':
+                if quality_ratio > 120:
+                    color = '#FFA726'
+                elif quality_ratio > 80:
+                    color = '#FF9800'
+                else:
+                    color = '#F57C00'
+
+        current_time = frame_number / self.fps if self.fps > 0 else 0
+        total_time = self.total_frames / self.fps if self.fps > 0 else 0
+
+        if self.frame_table:
+            size_kb = frame_size / 1024
+
+            if quality is not None:
+                qp_text = f", QP:{quality}"
+            else:
+                qp_text = ""
+
+            avg_size = self.avg_sizes.get(frame_type, 1)
+            quality_ratio = (frame_size / avg_size) * 100 if avg_size > 0 else 100
+
+            ref_text = ' [참조⭐]' if is_reference else ''
+
+            self.time_label.setText(
+                f'{self.format_time(current_time)} / {self.format_time(total_time)} '
+                f'<span style="color: {color}; font-weight: bold;">'
+                f'● {frame_type} ({size_kb:.4f}KB, {quality_ratio:.2f}%{qp_text}){ref_text}</span>'
+            )
+        else:
+            self.time_label.setText(
+                f'{self.format_time(current_time)} / {self.format_time(total_time)}'
+            )
+
+    def format_time(self, seconds):
+        hours = int(seconds // 3600)
+        minutes = int((seconds % 3600) // 60)
+        secs = int(seconds % 60)
+        millisecs = int((seconds % 1) * 1000)
+        return f'{hours:02d}:{minutes:02d}:{secs:02d}.{millisecs:03d}'
+
+    def on_slider_change(self, value):
+        frame_number = min(value, self.total_frames - 1)
+        # 드래그 중에는 키프레임 미리보기, 놓으면 정확한 프레임
+        self.show_frame(frame_number, exact=not self.timeline_slider.isSliderDown())
+
+    def on_slider_released(self):
+        self.show_frame(min(self.timeline_slider.value(), self.total_frames - 1))
+
+    def keyPressEvent(self, event):
+        if not self.timeline_slider.isEnabled():
+            return
+
+        current_value = self.timeline_slider.value()
+
+        if event.key() == Qt.Key_Left:
+            new_value = max(0, current_value - 1)
+            self.timeline_slider.setValue(new_value)
+        elif event.key() == Qt.Key_Right:
+            new_value = min(self.timeline_slider.maximum(), current_value + 1)
+            self.timeline_slider.setValue(new_value)
+        elif event.key() == Qt.Key_Up:
+            jump = int(self.fps) if self.fps > 0 else 30
+            new_value = min(self.timeline_slider.maximum(), current_value + jump)
+            self.timeline_slider.setValue(new_value)
+        elif event.key() == Qt.Key_Down:
+            jump = int(self.fps) if self.fps > 0 else 30
+            new_value = max(0, current_value - jump)
+            self.timeline_slider.setValue(new_value)
+        elif event.key() == Qt.Key_PageDown:
+            self.go_to_scene(forward=True)
+        elif event.key() == Qt.Key_PageUp:
+            self.go_to_scene(forward=False)
+        else:
+            super().keyPressEvent(event)
+
+    def capture_frame(self):
+        if self.current_frame is None:
+            QMessageBox.warning(self, '오류', '캡처할 프레임이 없습니다.')
+            return
+
+        frame_hash = dhash(cv2.cvtColor(self.current_frame, cv2.COLOR_BGR2GRAY))
+        if len(self.captured_hashes) and \
+                hamming_distance(frame_hash, self.captured_hashes).min() <= DEFAULT_DUPLICATE_RADIUS:
+            answer = QMessageBox.question(self, '중복 확인', '거의 같은 프레임을 이미 저장했습니다. 그래도 저장할까요?')
+            if answer != QMessageBox.Yes:
+                return
+
+        if self.video_path:
+            video_filename = Path(self.video_path).stem
+            default_name = f'{video_filename}.webp'
+        else:
+            current_frame_num = self.timeline_slider.value()
+            default_name = f'frame_{current_frame_num:06d}.webp'
+
+        project_dir = Path(__file__).parent / VERSION
+        project_dir.mkdir(exist_ok=True)
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, '프레임 저장', f'{project_dir}/{default_name}', 'webp Files (*.webp)'
+        )
+
+        if save_path:
+            try:
+                # 최대 384px 로 줄여서 WebP 로 저장
+                save_webp(self.current_frame, save_path)
+                self.captured_hashes = np.append(self.captured_hashes, np.uint64(frame_hash))
+
+                self.statusBar().showMessage(f'프레임 저장 완료 (리사이징 적용): {save_path}', 1500)
+            except Exception as e:
+                QMessageBox.critical(self, '오류', f'저장 실패:\n{str(e)}')
+
+        # self.capture_frame_png()
+
+    def capture_frame_png(self):
+        if self.current_frame is None:
+            QMessageBox.warning(self, '오류', '캡처할 프레임이 없습니다.')
+            return
+
+        if self.video_path:
+            video_filename = Path(self.video_path).stem
+            default_name = f'{video_filename}.png'
+        else:
+            current_frame_num = self.timeline_slider.value()
+            default_name = f'frame_{current_frame_num:06d}.png'
+
+        project_dir = Path(__file__).parent / VERSION
+        project_dir.mkdir(exist_ok=True)
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, '프레임 저장', f'{project_dir}/{default_name}', 'png Files (*.png)'
+        )
+
+        if save_path:
+            try:
+                frame_rgb = cv2.cvtColor(self.current_frame, cv2.COLOR_BGR2RGB)
+                pil_image = Image.fromarray(frame_rgb)
+                pil_image.save(save_path, 'PNG')
+
+                self.statusBar().showMessage(f'PNG 프레임 저장 완료: {save_path}', 1500)
+            except Exception as e:
+                QMessageBox.critical(self, '오류', f'저장 실패:\n{str(e)}')
+
+    def save_trace(self):
+        default_path = Path(self.video_path).with_suffix('.trace.json').name if self.video_path else 'trace.json'
+        save_path, _ = QFileDialog.getSaveFileName(self, '트레이스 저장', default_path, 'JSON Files (*.json)')
+        if not save_path:
+            return
+
+        try:
+            TRACER.write(save_path)
+        except OSError as e:
+            QMessageBox.critical(self, '오류', f'저장 실패:\n{str(e)}')
+            return
+
+        TRACER.print_summary()
+        self.statusBar().showMessage(f'트레이스 저장 완료: {save_path}', 3000)
+
+    def closeEvent(self, event):
+        self.cancel_analysis()
+        # 실행 중인 작업 단위가 끝나면 작업 프로세스 종료
+        self.worker_pool.shutdown()
+        # 취소된 분석 스레드가 정리를 마칠 때까지 기다림 (실행 중인 QThread 를 없애지 않도록)
+        for thread in list(self.cancelled_threads):
+            thread.wait()
+        self.cancel_export()
+        self.stop_frame_decoding()
+        if self.frame_reader:
+            self.frame_reader.release()
+        event.accept()
+
+
+def main():
+    # 켜면 이벤트 수에 상한이 있어 계속 켜 두어도 됨 (트레이스 저장 버튼으로 언제든 내보내기)
+    TRACER.enabled = '--trace' in sys.argv[1:] or os.environ.get(TRACE_ENV_VAR) == '1'
+    app = QApplication(sys.argv)
+    window = VideoFrameExtractor()
+    window.show()
+    sys.exit(app.exec_())
@@ -0,0 +1,183 @@
+import numpy as np
+
+
+# 이 해밍 거리 이하면 거의 같은 프레임으로 간주 (64비트 dHash 기준)
+DEFAULT_DUPLICATE_RADIUS = 5
+# 64비트 해시를 나누는 조각 수 (조각당 16비트)
+CHUNKS = 4
+CHUNK_BITS = 64 // CHUNKS
+# 이 거리 이상이면 조각 색인 대신 전체 popcount 비교
+BRUTE_FORCE_RADIUS = 12
+HASH_MASK = (1 << 64) - 1
+
+_POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+# 조각 반경별 16비트 XOR 마스크 (popcount <= 반경)
+_CHUNK_MASKS = {}
+# 같은 마스크의 파이썬 int 목록 (add() 로 넣은 항목 검색용)
+_CHUNK_MASK_LISTS = {}
+
+
+def popcount64(values):
+    """uint64 배열의 비트 수 (NumPy 2.0 이상은 bitwise_count 사용)"""
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    return _POPCOUNT8[values.reshape(-1, 1).view(np.uint8)].sum(axis=1, dtype=np.uint8).reshape(values.shape)
+
+
+def hamming_distance(value, hashes):
+    return popcount64(np.asarray(hashes, dtype=np.uint64) ^ np.uint64(value))
+
+
+def _chunk_masks(radius):
+    masks = _CHUNK_MASKS.get(radius)
+    if masks is None:
+        candidates = np.arange(1 << CHUNK_BITS, dtype=np.uint64)
+        masks = candidates[popcount64(candidates) <= radius].astype(np.uint16)
+        _CHUNK_MASKS[radius] = masks
+    return masks
+
+
+def _chunk_mask_list(radius):
+    masks = _CHUNK_MASK_LISTS.get(radius)
+    if masks is None:
+        masks = _chunk_masks(radius).tolist()
+        _CHUNK_MASK_LISTS[radius] = masks
+    return masks
+
+
+class HashIndex:
+    """64비트 해시의 해밍 거리 검색용 multi-index hashing 색인
+
+    해시를 16비트 조각 4개로 나눠 조각마다 정렬된 배열을 만들어 둠. 거리가 r 이하인
+    두 해시는 비둘기집 원리로 적어도 한 조각의 거리가 r // 4 이하이므로, 그 범위의
+    조각 값만 이진 탐색해서 후보를 모은 뒤 전체 popcount 로 확인.
+
+    처음에 준 hashes 는 조각마다 정렬된 배열로, add() 로 하나씩 넣는 해시는 조각마다
+    조각 값 -> 위치 목록 dict 로 보관하므로 넣으면서 검색해도 매번 다시 정렬하지 않음
+    (위치는 hashes 다음부터 넣은 순서대로 이어짐)
+    """
+
+    def __init__(self, hashes=()):
+        self.hashes = np.ascontiguousarray(hashes, dtype=np.uint64)
+        self.tables = []
+        for c in range(CHUNKS):
+            keys = ((self.hashes >> np.uint64(c * CHUNK_BITS)) & np.uint64(0xFFFF)).astype(np.uint16)
+            order = np.argsort(keys, kind='stable')
+            self.tables.append((keys[order], order))
+        self.added = []
+        self.buckets = [{} for _ in range(CHUNKS)]
+
+    def __len__(self):
+        return len(self.hashes) + len(self.added)
+
+    def add(self, value):
+        """해시 하나를 추가하고 그 위치 반환"""
+        value = int(value) & HASH_MASK
+        pos = len(self)
+        self.added.append(value)
+        for c, bucket in enumerate(self.buckets):
+            bucket.setdefault((value >> (c * CHUNK_BITS)) & 0xFFFF, []).append(pos)
+        return pos
+
+    def query(self, value, radius=DEFAULT_DUPLICATE_RADIUS):
+        """value 와 해밍 거리가 radius 이하인 항목의 위치 (오름차순)"""
+        if radius >= BRUTE_FORCE_RADIUS:
+            hashes = np.concatenate([self.hashes, np.asarray(self.added, dtype=np.uint64)])
+            return np.flatnonzero(hamming_distance(int(value) & HASH_MASK, hashes) <= radius)
+
+        found = self._query_sorted(value, radius) if len(self.hashes) else np.empty(0, dtype=np.int64)
+        if self.added:
+            found = np.concatenate([found, self._query_added(value, radius)])
+        return found
+
+    def _query_added(self, value, radius):
+        value = int(value) & HASH_MASK
+        base = len(self.hashes)
+        candidates = set()
+        for c, bucket in enumerate(self.buckets):
+            chunk = (value >> (c * CHUNK_BITS)) & 0xFFFF
+            for mask in _chunk_mask_list(radius // CHUNKS):
+                positions = bucket.get(chunk ^ mask)
+                if positions:
+                    candidates.update(positions)
+
+        matches = [pos for pos in candidates if bin(value ^ self.added[pos - base]).count('1') <= radius]
+        return np.asarray(sorted(matches), dtype=np.int64)
+
+    def _query_sorted(self, value, radius):
+        value = np.uint64(int(value) & HASH_MASK)
+        masks = _chunk_masks(radius // CHUNKS)
+        parts = []
+        for c, (keys, order) in enumerate(self.tables):
+            chunk = np.uint16((value >> np.uint64(c * CHUNK_BITS)) & np.uint64(0xFFFF))
+            probes = np.sort(chunk ^ masks)
+            lo = np.searchsorted(keys, probes, side='left')
+            hi = np.searchsorted(keys, probes, side='right')
+            for start, end in zip(lo[hi > lo].tolist(), hi[hi > lo].tolist()):
+                parts.append(order[start:end])
+
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+
+        candidates = np.unique(np.concatenate(parts))
+        return candidates[hamming_distance(value, self.hashes[candidates]) <= radius]
+
+
+def drop_near_duplicates(frame_indices, hashes, radius=DEFAULT_DUPLICATE_RADIUS):
+    """frame_indices 순서(우선순위)대로 보면서 이미 남긴 프레임과 거의 같은 프레임은 제외
+
+    남긴 프레임의 해시를 HashIndex 에 하나씩 넣으면서 검색하므로 프레임 수에 비례하는 시간
+    """
+    index = HashIndex()
+    kept = []
+
+    for idx in np.asarray(frame_indices, dtype=np.int64).tolist():
+        value = hashes[idx]
+        if len(index) and len(index.query(value, radius)):
+            continue
+        index.add(value)
+        kept.append(idx)
+
+    return np.asarray(kept, dtype=np.int64)
+
+
+def group_near_duplicates(hashes, valid, radius=DEFAULT_DUPLICATE_RADIUS):
+    """거의 같은 프레임끼리 같은 묶음 번호 (0부터, valid 가 아닌 프레임은 -1)
+
+    시간상 이웃한 프레임끼리 비슷하면 같은 묶음으로 잇고 (벡터 연산), 떨어진 곳에서
+    다시 나오는 같은 화면은 묶음 대표 프레임을 HashIndex 에 하나씩 넣으면서 앞의 대표와 합침
+    """
+    groups = np.full(len(hashes), -1, dtype=np.int64)
+    frames = np.flatnonzero(valid)
+    if len(frames) == 0:
+        return groups
+
+    values = np.ascontiguousarray(hashes[frames], dtype=np.uint64)
+    new_run = np.ones(len(frames), dtype=np.bool_)
+    new_run[1:] = popcount64(values[1:] ^ values[:-1]) > radius
+    run_ids = np.cumsum(new_run) - 1
+    representatives = values[new_run]
+
+    parent = np.arange(len(representatives))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # 대표를 넣은 순서와 색인 위치가 같으므로 검색 결과가 곧 앞에 나온 대표 번호
+    index = HashIndex()
+    for i, value in enumerate(representatives.tolist()):
+        for j in index.query(value, radius).tolist():
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+        index.add(value)
+
+    roots = np.array([find(i) for i in range(len(representatives))], dtype=np.int64)
+    # 묶음 번호를 처음 나오는 순서대로 0, 1, 2... 로 정리
+    _, compact = np.unique(roots, return_inverse=True)
+    groups[frames] = compact[run_ids]
+    return groups
@@ -0,0 +1,86 @@
+import subprocess
+import tempfile
+
+import numpy as np
+
+
+# 파이프 읽기 버퍼 크기 (프레임 여러 장 분량을 한 번에 받도록 넉넉하게)
+PIPE_BUFFER_BYTES = 4 * 1024 * 1024
+# 축소 시 사용하는 ffmpeg 스케일러 (OpenCV 의 INTER_AREA 와 같은 면적 평균)
+SCALE_FLAGS = 'area'
+
+
+def analysis_size(width, height, analysis_width=0):
+    """분석 해상도 (가로세로 비율 유지, 짝수 크기), analysis_width 가 0 이거나 원본보다 크면 원본"""
+    width, height = int(width), int(height)
+    if analysis_width <= 0 or analysis_width >= width:
+        return width, height
+
+    scaled_width = max(2, int(analysis_width) // 2 * 2)
+    scaled_height = max(2, int(round(height * scaled_width / width / 2)) * 2)
+    return scaled_width, scaled_height
+
+
+def iter_luma_frames(video_path, start_time, frame_count, source_size, size=None):
+    """ffmpeg 로 start_time(초) 부터 frame_count 개 프레임을 흑백(Y)으로 디코딩해서 반환
+
+    ffmpeg 가 rawvideo gray 로 파이프에 쓰는 프레임을 하나의 버퍼에 readinto 로 받아
+    np.frombuffer 로 감싸서 넘기므로, 반환된 배열은 다음 프레임을 읽으면 덮어써짐.
+    size 가 source_size 와 다르면 ffmpeg 안에서 축소한 뒤 전달.
+    start_time 은 컨테이너 시작 시각 (probe.probe_start_time) 기준.
+    frame_count 개보다 적게 나오거나 ffmpeg 가 실패하면 stderr 내용과 함께 RuntimeError
+    """
+    width, height = size or source_size
+
+    cmd = [
+        'ffmpeg',
+        '-v', 'error',
+        '-nostdin',
+    ]
+    if start_time > 0:
+        # 입력 옵션 -ss: 앞쪽 키프레임으로 탐색 후 start_time 까지 디코딩해서 버림
+        cmd += ['-ss', f'{start_time:.6f}']
+    cmd += [
+        '-i', video_path,
+        '-map', '0:v:0',
+        '-frames:v', str(frame_count),
+        # 프레임 복제/누락 없이 디코딩된 프레임을 그대로 출력 (프레임 번호 유지, ffmpeg 5.1 이상)
+        '-fps_mode', 'passthrough',
+    ]
+    if (width, height) != tuple(source_size):
+        cmd += ['-vf', f'scale={width}:{height}:flags={SCALE_FLAGS}']
+    cmd += ['-f', 'rawvideo', '-pix_fmt', 'gray', '-']
+
+    frame_bytes = width * height
+    buffer = bytearray(frame_bytes)
+    view = memoryview(buffer)
+    gray = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width)
+
+    # stderr 를 파이프로 받으면 stdout 을 읽는 동안 막힐 수 있으므로 임시 파일로 받음
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, bufsize=PIPE_BUFFER_BYTES)
+        decoded = 0
+        try:
+            while decoded < frame_count:
+                filled = 0
+                while filled < frame_bytes:
+                    n = proc.stdout.readinto(view[filled:])
+                    if not n:
+                        break
+                    filled += n
+                if filled < frame_bytes:
+                    break
+                decoded += 1
+                yield gray
+        finally:
+            # 중간에 멈춘 경우 (취소, 예외) ffmpeg 도 종료
+            if proc.poll() is None and decoded < frame_count:
+                proc.kill()
+            proc.stdout.close()
+            returncode = proc.wait()
+
+        if decoded < frame_count or returncode != 0:
+            stderr_file.seek(0)
+            message = stderr_file.read().decode('utf-8', errors='replace').strip()
+            raise RuntimeError(f"ffmpeg 디코딩 실패 ({frame_count}개 중 {decoded}개 출력, "
+                               f"종료 코드 {returncode}): {message}")
@@ -0,0 +1,300 @@
+import math
+import time
+
+import cv2
+import numpy as np
+
+
+# 한 번에 모아서 계산하는 프레임 수 (원본 해상도면 배치 버퍼가 커지므로 작게 유지)
+BATCH_SIZE = 8
+# 이 값 이하/이상인 화소를 노출 부족/과다(클리핑)로 간주
+DARK_CLIP_LEVEL = 5
+BRIGHT_CLIP_LEVEL = 250
+
+# 장면 전환 검출에 쓰는 밝기 히스토그램 구간 수
+SCENE_HIST_BINS = 32
+# dHash 크기 (가로 차이를 보므로 (DHASH_SIZE + 1) x DHASH_SIZE 로 축소 -> 64비트)
+DHASH_SIZE = 8
+
+# Immerkaer 잡음 추정 커널
+NOISE_KERNEL = np.array([[1, -2, 1],
+                         [-2, 4, -2],
+                         [1, -2, 1]], dtype=np.float32)
+
+
+class Metric:
+    """한 배치(N, H, W 흑백 프레임)에서 하나 이상의 열(column)을 계산하는 지표
+
+    stateful 지표는 func(batch, low_precision, state) 로 호출되고, state 는 작업 단위 안에서
+    배치 사이에 유지되는 dict (직전 프레임과 비교하는 지표용).
+    dtype 은 열의 자료형 (해시처럼 float64 로 표현할 수 없는 값은 정수형)
+    """
+    __slots__ = ('name', 'columns', 'func', 'description', 'stateful', 'dtype')
+
+    def __init__(self, name, columns, func, description='', stateful=False, dtype=np.float64):
+        self.name = name
+        self.columns = columns
+        self.func = func
+        self.description = description
+        self.stateful = stateful
+        self.dtype = dtype
+
+
+# 이름 -> Metric (등록 순서 유지)
+METRICS = {}
+
+
+def register_metric(name, columns=None, description='', stateful=False, dtype=np.float64):
+    """func(batch, low_precision) -> {column: (N,) 배열} 를 지표로 등록하는 데코레이터
+
+    columns 를 생략하면 지표 이름과 같은 열 하나를 만든다고 봄
+    """
+    def decorator(func):
+        METRICS[name] = Metric(name, tuple(columns or (name,)), func, description, stateful, dtype)
+        return func
+    return decorator
+
+
+def metric_columns(metric_names):
+    """지표 이름 목록이 만드는 열 이름 목록"""
+    return [column for name in metric_names for column in METRICS[name].columns]
+
+
+# ---- 프레임 단위 계산 ----
+
+def laplacian_variance(gray, low_precision=False):
+    """흑백 프레임의 라플라시안 분산 (선명도)
+
+    low_precision=True 이면 CV_64F 대신 CV_16S 로 계산 (8비트 입력의 3x3 라플라시안은
+    int16 범위를 넘지 않으므로 값은 같고 메모리 대역폭만 1/4)
+    """
+    if low_precision:
+        laplacian = cv2.Laplacian(gray, cv2.CV_16S)
+        _, stddev = cv2.meanStdDev(laplacian)
+        return float(stddev[0, 0]) ** 2
+
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+def _mean_square(image):
+    # E[x^2] = 분산 + 평균^2 (제곱 배열을 따로 만들지 않음)
+    mean, stddev = cv2.meanStdDev(image)
+    return float(stddev[0, 0]) ** 2 + float(mean[0, 0]) ** 2
+
+
+def tenengrad(gray, low_precision=False):
+    """Sobel 기울기 크기 제곱의 평균"""
+    depth = cv2.CV_16S if low_precision else cv2.CV_32F
+    gx = cv2.Sobel(gray, depth, 1, 0)
+    gy = cv2.Sobel(gray, depth, 0, 1)
+    return _mean_square(gx) + _mean_square(gy)
+
+
+def noise_sigma(gray, low_precision=False):
+    """Immerkaer 방식 잡음 표준편차 추정"""
+    height, width = gray.shape
+    if height < 3 or width < 3:
+        return 0.0
+
+    depth = cv2.CV_16S if low_precision else cv2.CV_32F
+    response = cv2.filter2D(gray, depth, NOISE_KERNEL, borderType=cv2.BORDER_REFLECT)
+    # 가장자리는 커널이 반사된 값이라 제외
+    total = cv2.norm(response[1:-1, 1:-1], cv2.NORM_L1)
+    return math.sqrt(math.pi / 2) * total / (6 * (width - 2) * (height - 2))
+
+
+def brenner(gray, low_precision=False):
+    """2화소 간격 가로 차분 제곱의 평균"""
+    # uint8 차이는 ±255 라 CV_16S 로 충분
+    diff = cv2.subtract(gray[:, 2:], gray[:, :-2], dtype=cv2.CV_16S)
+    return _mean_square(diff)
+
+
+def luma_histograms(batch):
+    """배치의 프레임별 밝기 히스토그램 (합이 1 이 되도록 정규화, float32)"""
+    hists = np.empty((len(batch), SCENE_HIST_BINS), dtype=np.float32)
+    for i, gray in enumerate(batch):
+        hists[i] = cv2.calcHist([gray], [0], None, [SCENE_HIST_BINS], [0, 256]).ravel()
+    hists /= hists.sum(axis=1, keepdims=True)
+    return hists
+
+
+def histogram_distance(a, b):
+    """정규화된 히스토그램 사이의 거리 (0: 같음 ~ 1: 겹치는 구간 없음)"""
+    return 0.5 * np.abs(np.asarray(a) - np.asarray(b)).sum(axis=-1)
+
+
+# ---- 등록된 지표 (배치 단위) ----
+
+@register_metric('sharpness', description='라플라시안 분산')
+def _sharpness_metric(batch, low_precision):
+    return {'sharpness': np.array([laplacian_variance(g, low_precision) for g in batch])}
+
+
+@register_metric('tenengrad', description='Sobel 기울기 에너지')
+def _tenengrad_metric(batch, low_precision):
+    return {'tenengrad': np.array([tenengrad(g, low_precision) for g in batch])}
+
+
+@register_metric('brenner', description='2화소 간격 가로 차분 제곱 평균')
+def _brenner_metric(batch, low_precision):
+    return {'brenner': np.array([brenner(g, low_precision) for g in batch])}
+
+
+@register_metric('exposure', columns=('brightness', 'dark_clip', 'bright_clip'),
+                 description='평균 밝기와 노출 부족/과다 화소 비율')
+def _exposure_metric(batch, low_precision):
+    return {
+        'brightness': batch.mean(axis=(1, 2), dtype=np.float64),
+        'dark_clip': (batch <= DARK_CLIP_LEVEL).mean(axis=(1, 2)),
+        'bright_clip': (batch >= BRIGHT_CLIP_LEVEL).mean(axis=(1, 2)),
+    }
+
+
+@register_metric('noise', description='Immerkaer 잡음 표준편차')
+def _noise_metric(batch, low_precision):
+    return {'noise': np.array([noise_sigma(g, low_precision) for g in batch])}
+
+
+@register_metric('scene', columns=('scene_diff',), stateful=True,
+                 description='직전 분석 프레임과의 밝기 히스토그램 거리')
+def _scene_metric(batch, low_precision, state):
+    hists = luma_histograms(batch)
+    previous = state.get('last_hist')
+
+    diffs = np.empty(len(hists), dtype=np.float64)
+    # 작업 단위의 첫 프레임은 직전 프레임이 다른 프로세스에 있으므로 나중에 이어 붙임
+    diffs[0] = histogram_distance(hists[0], previous) if previous is not None else np.nan
+    diffs[1:] = histogram_distance(hists[1:], hists[:-1])
+
+    if previous is None:
+        state['first_hist'] = hists[0].copy()
+    state['last_hist'] = hists[-1].copy()
+    return {'scene_diff': diffs}
+
+
+def dhash(gray):
+    """흑백 프레임 하나의 64비트 dHash"""
+    return int(_dhash_metric(gray[np.newaxis], False)['dhash'][0])
+
+
+@register_metric('dhash', description='64비트 차이 해시 (거의 같은 프레임 찾기용)', dtype=np.uint64)
+def _dhash_metric(batch, low_precision):
+    small = np.empty((len(batch), DHASH_SIZE, DHASH_SIZE + 1), dtype=np.uint8)
+    for i, gray in enumerate(batch):
+        small[i] = cv2.resize(gray, (DHASH_SIZE + 1, DHASH_SIZE), interpolation=cv2.INTER_AREA)
+
+    # 오른쪽 화소가 더 밝으면 1, 한 프레임의 64비트를 big-endian uint64 하나로 묶음
+    bits = small[:, :, 1:] > small[:, :, :-1]
+    packed = np.packbits(bits.reshape(len(batch), -1), axis=1)
+    return {'dhash': packed.view('>u8').ravel().astype(np.uint64)}
+
+
+# 기본으로 계산하는 지표 (GUI 가 쓰는 것만, tenengrad/brenner 처럼 비싼 비교용 지표는 CLI --metrics 로 선택)
+DEFAULT_METRICS = ('sharpness', 'exposure', 'noise', 'scene', 'dhash')
+
+
+class MetricAccumulator:
+    """디코딩된 흑백 프레임을 배치 버퍼에 모았다가 모든 지표를 한 번에 계산
+
+    프레임은 한 번만 디코딩되고, 지표를 추가해도 같은 배치 버퍼를 재사용함.
+    결과는 열 이름 -> 배열 (frame_index 열 포함) 에, 작업 단위 경계를 이어 붙일 때 쓰는
+    'boundary' (첫/마지막 프레임 번호와 stateful 지표의 state) 가 추가된 dict.
+    output (shared_columns.SharedColumns) 을 주면 배치마다 값을 그 배열에 바로 쓰고,
+    결과에는 열 대신 분석한 프레임 수 'frame_count' 만 들어감.
+    scored (프레임 번호로 인덱싱되는 선명도 배열, output 과 함께 사용) 를 주면 이미 값이 있는
+    프레임은 stateful 지표만 계산해서 기록 (이웃 프레임 비교에는 넣되 나머지 지표는 다시 계산하지 않음)
+    """
+
+    def __init__(self, metric_names=DEFAULT_METRICS, low_precision=False, batch_size=BATCH_SIZE, tracer=None,
+                 output=None, scored=None):
+        self.metrics = [METRICS[name] for name in metric_names]
+        self.low_precision = low_precision
+        self.batch_size = batch_size
+        # 주어지면 지표별 계산 시간을 'metric:<이름>' 으로 누적 (tracing.Tracer)
+        self.tracer = tracer
+        self.output = output
+        self.scored = scored if output is not None else None
+
+        self.batch = None
+        self.batch_indices = []
+        self.frame_indices = []
+        self.columns = {column: [] for column in metric_columns(metric_names)}
+        self.dtypes = {column: metric.dtype for metric in self.metrics for column in metric.columns}
+        self.stateful_columns = {column for metric in self.metrics if metric.stateful for column in metric.columns}
+        self.states = {metric.name: {} for metric in self.metrics if metric.stateful}
+
+    def add(self, frame_index, gray):
+        """gray 를 배치 버퍼에 복사 (호출 후 gray 는 재사용해도 됨)"""
+        if self.batch is None or self.batch.shape[1:] != gray.shape:
+            self.flush()
+            self.batch = np.empty((self.batch_size,) + gray.shape, dtype=np.uint8)
+
+        np.copyto(self.batch[len(self.batch_indices)], gray)
+        self.batch_indices.append(frame_index)
+
+        if len(self.batch_indices) == self.batch_size:
+            self.flush()
+
+    def flush(self):
+        count = len(self.batch_indices)
+        if count == 0:
+            return
+
+        batch = self.batch[:count]
+        # 아직 값이 없는 프레임 (None 이면 배치 전체)
+        fresh = None
+        if self.scored is not None:
+            fresh = np.isnan(self.scored[np.asarray(self.batch_indices, dtype=np.int64)])
+            if fresh.all():
+                fresh = None
+
+        batch_columns = {}
+        started = time.perf_counter()
+        for metric in self.metrics:
+            if metric.stateful:
+                values_by_column = metric.func(batch, self.low_precision, self.states[metric.name])
+            elif fresh is None:
+                values_by_column = metric.func(batch, self.low_precision)
+            elif fresh.any():
+                values_by_column = metric.func(batch[fresh], self.low_precision)
+            else:
+                continue
+            for column, values in values_by_column.items():
+                batch_columns[column] = np.asarray(values, dtype=metric.dtype)
+            if self.tracer is not None:
+                started = self.tracer.lap(f'metric:{metric.name}', started)
+
+        if fresh is not None:
+            # stateful 열은 배치 전체, 나머지는 값이 없던 프레임에만 (선명도가 마지막에 쓰이도록 나중에)
+            self.output.write(self.batch_indices, {column: values for column, values in batch_columns.items()
+                                                   if column in self.stateful_columns})
+            self.output.write(np.asarray(self.batch_indices, dtype=np.int64)[fresh],
+                              {column: values for column, values in batch_columns.items()
+                               if column not in self.stateful_columns})
+        elif self.output is not None:
+            self.output.write(self.batch_indices, batch_columns)
+        else:
+            for column, values in batch_columns.items():
+                self.columns[column].append(values)
+
+        self.frame_indices.extend(self.batch_indices)
+        self.batch_indices = []
+
+    def result(self):
+        self.flush()
+
+        if self.output is not None:
+            result = {'frame_count': len(self.frame_indices)}
+        else:
+            result = {'frame_index': np.asarray(self.frame_indices, dtype=np.int64)}
+            for column, parts in self.columns.items():
+                result[column] = np.concatenate(parts) if parts else np.empty(0, dtype=self.dtypes[column])
+
+        if self.frame_indices:
+            result['boundary'] = {
+                'first_index': self.frame_indices[0],
+                'last_index': self.frame_indices[-1],
+                'states': self.states,
+            }
+        return result
@@ -0,0 +1,247 @@
+import subprocess
+import tempfile
+
+import numpy as np
+
+from tracing import TRACER, now_us
+
+
+# ffprobe pict_type 문자 (av_get_picture_type_char 기준)
+FRAME_TYPES = ['?', 'I', 'P', 'B', 'S', 'i', 'p', 'b']
+FRAME_TYPE_CODES = {t: i for i, t in enumerate(FRAME_TYPES)}
+
+# 진행 상황 콜백을 호출할 프레임 간격
+PROGRESS_INTERVAL = 5000
+# 예상 프레임 수를 모를 때의 초기 배열 크기
+INITIAL_CAPACITY = 4096
+# 추적이 켜져 있을 때 ffprobe 출력 이 줄 수마다 구간 하나를 기록
+TRACE_ROWS = 5000
+
+COLUMNS = ('type_code', 'size', 'quality', 'key_frame', 'pts')
+
+
+class ProbeCancelled(Exception):
+    """cancel_event 가 설정되어 ffprobe 를 중간에 종료함"""
+
+
+class ProbeArrays:
+    """ffprobe 결과를 한 줄씩 채워 넣는 미리 할당된 배열 묶음"""
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        capacity = max(1, capacity)
+        self.count = 0
+        self.type_code = np.zeros(capacity, dtype=np.uint8)
+        self.size = np.zeros(capacity, dtype=np.int64)
+        self.quality = np.full(capacity, np.nan, dtype=np.float64)
+        self.key_frame = np.zeros(capacity, dtype=np.uint8)
+        self.pts = np.full(capacity, np.nan, dtype=np.float64)
+
+    def _grow(self):
+        capacity = len(self.size) * 2
+        for name in COLUMNS:
+            old = getattr(self, name)
+            new = np.full(capacity, np.nan, dtype=old.dtype) if name in ('quality', 'pts') \
+                else np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def append(self, type_code, size, quality, key_frame, pts):
+        if self.count == len(self.size):
+            self._grow()
+
+        i = self.count
+        self.type_code[i] = type_code
+        self.size[i] = size
+        self.quality[i] = quality
+        self.key_frame[i] = key_frame
+        self.pts[i] = pts
+        self.count += 1
+
+    def trim(self):
+        """채워진 부분만 남기고 여분 용량 정리"""
+        for name in COLUMNS:
+            setattr(self, name, getattr(self, name)[:self.count].copy())
+
+    def reorder(self, order):
+        """order 순서대로 모든 열을 재배치 (trim 이후에 호출)"""
+        for name in COLUMNS:
+            setattr(self, name, getattr(self, name)[order])
+
+    def has_quality(self):
+        return bool(np.any(~np.isnan(self.quality[:self.count])))
+
+
+def _parse_number(value, default):
+    if value is None or value == 'N/A' or value == '':
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _initial_capacity(expected_frames):
+    # 여유분을 두고 예상 프레임 수만큼 미리 할당
+    return int(expected_frames * 1.05) + 16 if expected_frames > 0 else INITIAL_CAPACITY
+
+
+def _iter_compact_rows(cmd, cancel_event=None):
+    """ffprobe compact 출력을 한 줄씩 {key: value} 로 변환해서 반환
+
+    cancel_event (threading.Event) 가 설정되면 다음 줄에서 ffprobe 를 바로 종료하고 ProbeCancelled
+    """
+    # stderr 를 파이프로 받으면 stdout 을 읽는 동안 막힐 수 있으므로 임시 파일로 받음
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file,
+                                text=True, bufsize=1024 * 1024)
+        try:
+            # 가장 많이 도는 반복이므로 줄마다 기록하지 않고 TRACE_ROWS 줄마다 구간 하나
+            # (파이프 읽기 + 파싱 + 호출 측의 배열 기록 포함)
+            tracing = TRACER.enabled
+            rows = 0
+            rows_start = now_us()
+            for line in proc.stdout:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ProbeCancelled()
+                fields = {}
+                for item in line.rstrip('\n').split('|'):
+                    key, sep, value = item.partition('=')
+                    if sep:
+                        fields[key] = value
+                yield fields
+
+                if tracing:
+                    rows += 1
+                    if rows == TRACE_ROWS:
+                        now = now_us()
+                        TRACER.add('ffprobe_rows', rows_start, now - rows_start, 'probe', {'rows': rows})
+                        rows, rows_start = 0, now
+
+            if tracing and rows:
+                TRACER.add('ffprobe_rows', rows_start, now_us() - rows_start, 'probe', {'rows': rows})
+            returncode = proc.wait()
+        except BaseException:
+            # 호출 측에서 중간에 멈춘 경우 (취소, 예외) ffprobe 도 종료
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            proc.stdout.close()
+
+        if returncode != 0:
+            stderr_file.seek(0)
+            message = stderr_file.read().decode('utf-8', errors='replace').strip()
+            raise RuntimeError(f"ffprobe 종료 코드 {returncode}: {message}")
+
+
+def probe_start_time(video_path):
+    """컨테이너 시작 시각 (format=start_time, 초, 없으면 0)
+
+    ffmpeg 입력 -ss 는 첫 비디오 프레임이 아니라 이 시각을 0 으로 보고 탐색함
+    (오디오 프라이밍, 편집 목록 등으로 비디오가 컨테이너보다 늦게 시작하는 파일이 흔함)
+    """
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-show_entries', 'format=start_time',
+        '-of', 'default=nw=1:nk=1',
+        video_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe 종료 코드 {result.returncode}: {result.stderr.strip()}")
+    return _parse_number(result.stdout.strip(), 0.0)
+
+
+def probe_frames(video_path, expected_frames=0, on_progress=None, progress_interval=PROGRESS_INTERVAL,
+                 cancel_event=None):
+    """ffprobe 프레임 정보를 파이프에서 한 줄씩 읽어 배열로 수집 (모든 프레임 디코딩)
+
+    on_progress(probe_arrays) 는 progress_interval 프레임마다 호출되며,
+    probe_arrays.count 까지의 값은 ffprobe 가 끝나기 전에도 사용 가능
+    """
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_frames',
+        '-show_entries', 'frame=pict_type,pkt_size,quality,key_frame,pts_time',
+        '-of', 'compact=p=0:nk=0',
+        video_path
+    ]
+
+    arrays = ProbeArrays(_initial_capacity(expected_frames))
+
+    for fields in _iter_compact_rows(cmd, cancel_event):
+        if 'pkt_size' not in fields and 'pict_type' not in fields:
+            continue
+
+        arrays.append(
+            FRAME_TYPE_CODES.get(fields.get('pict_type', '?'), 0),
+            int(_parse_number(fields.get('pkt_size'), 0)),
+            _parse_number(fields.get('quality'), np.nan),
+            int(_parse_number(fields.get('key_frame'), 0)),
+            _parse_number(fields.get('pts_time'), np.nan)
+        )
+
+        if on_progress is not None and arrays.count % progress_interval == 0:
+            on_progress(arrays)
+
+    arrays.trim()
+
+    if on_progress is not None:
+        on_progress(arrays)
+
+    return arrays
+
+
+def probe_packets(video_path, expected_frames=0, on_progress=None, progress_interval=PROGRESS_INTERVAL,
+                  cancel_event=None):
+    """디코딩 없이 컨테이너의 패킷 정보(크기, 키프레임 플래그, pts)만으로 빠르게 수집
+
+    픽처 타입은 알 수 없으므로 키프레임은 'I', 나머지는 '?' 로 표시.
+    패킷은 디코딩 순서로 나오므로 마지막에 pts 기준 표시 순서로 재정렬
+    """
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'packet=size,flags,pts_time,dts_time',
+        '-of', 'compact=p=0:nk=0',
+        video_path
+    ]
+
+    arrays = ProbeArrays(_initial_capacity(expected_frames))
+    i_code = FRAME_TYPE_CODES['I']
+    unknown_code = FRAME_TYPE_CODES['?']
+
+    for fields in _iter_compact_rows(cmd, cancel_event):
+        if 'size' not in fields:
+            continue
+
+        key_frame = 1 if 'K' in fields.get('flags', '') else 0
+        pts = _parse_number(fields.get('pts_time'), np.nan)
+        if pts != pts:
+            pts = _parse_number(fields.get('dts_time'), np.nan)
+
+        arrays.append(
+            i_code if key_frame else unknown_code,
+            int(_parse_number(fields.get('size'), 0)),
+            np.nan,
+            key_frame,
+            pts
+        )
+
+        if on_progress is not None and arrays.count % progress_interval == 0:
+            on_progress(arrays)
+
+    arrays.trim()
+
+    # 디코딩 순서 -> 표시 순서 (B 프레임이 있으면 두 순서가 다름)
+    if arrays.count and not np.isnan(arrays.pts).any():
+        arrays.reorder(np.argsort(arrays.pts, kind='stable'))
+
+    if on_progress is not None:
+        on_progress(arrays)
+
+    return arrays
@@ -0,0 +1,145 @@
+import math
+
+import numpy as np
+
+from frame_table import top_k_indices
+
+
+# 참조/I 프레임 우대 시 점수에 곱하는 기본 가중치 (1 + weight)
+DEFAULT_REFERENCE_WEIGHT = 0.2
+# 비트스트림 선별 점수 가중치 (log2 단위: 타입 평균 대비 크기 2배 = 1점)
+# QP 는 6 차이가 양자화 간격 2배이므로 6 낮을 때 TRIAGE_QP_WEIGHT 점
+TRIAGE_QP_WEIGHT = 1.0
+# 직전 키프레임에서 GOP 길이만큼 떨어질 때 빼는 점수
+TRIAGE_KEY_DISTANCE_WEIGHT = 0.5
+# 시간 억제에서 이미 막힌 후보를 한 번에 걸러내는 후보 묶음 크기
+NMS_BATCH = 4096
+
+
+def frames_for_seconds(frame_table, seconds):
+    """seconds 를 프레임 수로 환산 (pts 간격의 중앙값 기준, pts 가 없으면 30fps 로 가정)
+
+    베스트 프레임 최소 간격 등 초 단위 설정은 GUI/CLI 모두 이 함수로 프레임 수로 바꿈
+    """
+    pts = frame_table.pts[~np.isnan(frame_table.pts)]
+    steps = np.diff(pts)
+    steps = steps[steps > 0]
+    frame_duration = float(np.median(steps)) if len(steps) else 1 / 30
+    return int(round(seconds / frame_duration))
+
+
+def bitstream_scores(frame_table, qp_weight=TRIAGE_QP_WEIGHT, key_distance_weight=TRIAGE_KEY_DISTANCE_WEIGHT):
+    """디코딩 없이 ffprobe 정보만으로 계산한 프레임별 선명도 추정 점수 (높을수록 선명할 가능성이 큼)
+
+    크기         : 같은 타입 평균 대비 패킷 크기의 log2 (디테일이 많을수록 같은 QP 에서 큼)
+    QP           : 같은 타입 QP 중앙값보다 낮을수록 가산 (QP 가 없으면 사용 안 함)
+    키프레임 거리 : 직전 키프레임에서 멀수록 감점 (예측 오차가 쌓이고 흐린 B/P 프레임이 많아짐)
+    """
+    n = len(frame_table)
+    scores = np.zeros(n, dtype=np.float64)
+    if n == 0:
+        return scores
+
+    size = np.maximum(frame_table.size, 1).astype(np.float64)
+    quality = frame_table.quality
+    has_quality = frame_table.has_quality()
+    qp_delta = np.zeros(n, dtype=np.float64)
+
+    for code in np.unique(frame_table.type_code).tolist():
+        mask = frame_table.type_code == code
+        scores[mask] = np.log2(size[mask] / size[mask].mean())
+        if has_quality:
+            mask &= ~np.isnan(quality)
+            if mask.any():
+                qp_delta[mask] = quality[mask] - np.median(quality[mask])
+
+    if has_quality:
+        scores -= qp_weight * qp_delta / 6
+
+    key_indices = np.flatnonzero(frame_table.key_frame)
+    if len(key_indices):
+        frames = np.arange(n)
+        previous = key_indices[np.maximum(np.searchsorted(key_indices, frames, side='right') - 1, 0)]
+        # 첫 키프레임 앞의 프레임은 비디오 시작부터의 거리
+        distance = np.where(previous <= frames, frames - previous, frames)
+        gop_length = float(np.median(np.diff(key_indices))) if len(key_indices) > 1 else n
+        scores -= key_distance_weight * distance / max(gop_length, 1.0)
+
+    return scores
+
+
+def triage_candidates(frame_table, fraction, indices=None, min_count=0):
+    """bitstream_scores 상위 fraction 비율 (최소 min_count 개) 프레임을 프레임 번호 순서로 반환"""
+    if indices is None:
+        indices = np.arange(len(frame_table))
+    indices = np.asarray(indices, dtype=np.int64)
+
+    k = min(len(indices), max(min_count, math.ceil(len(indices) * fraction)))
+    scores = bitstream_scores(frame_table)[indices]
+    return np.sort(indices[top_k_indices(scores, k)])
+
+
+def _best_per_bucket(candidates, scores, buckets):
+    """같은 bucket 안에서 점수가 가장 높은 후보 하나씩 (동점이면 앞 프레임)"""
+    order = np.lexsort((candidates, -scores, buckets))
+    sorted_buckets = buckets[order]
+    first = np.ones(len(order), dtype=np.bool_)
+    first[1:] = sorted_buckets[1:] != sorted_buckets[:-1]
+    keep = order[first]
+    return candidates[keep], scores[keep]
+
+
+def _greedy_nms(candidates, scores, k, min_gap, length):
+    """점수 순으로 고르면서 이미 고른 프레임과 min_gap 미만으로 가까운 후보는 버림
+
+    고른 프레임 앞뒤 min_gap - 1 프레임을 막힌 구간 비트맵 (길이 length) 에 표시하고,
+    점수 순 후보를 NMS_BATCH 개씩 잘라 이미 막힌 후보는 벡터 연산으로 먼저 걸러냄
+    """
+    ordered = candidates[np.lexsort((candidates, -scores))]
+    blocked = np.zeros(length, dtype=np.bool_)
+    chosen = []
+
+    for start in range(0, len(ordered), NMS_BATCH):
+        batch = ordered[start:start + NMS_BATCH]
+        for idx in batch[~blocked[batch]].tolist():
+            # 같은 묶음 안에서 앞서 고른 프레임에 막혔을 수 있음
+            if blocked[idx]:
+                continue
+
+            chosen.append(idx)
+            if len(chosen) == k:
+                return np.asarray(chosen, dtype=np.int64)
+            blocked[max(0, idx - min_gap + 1):idx + min_gap] = True
+
+    return np.asarray(chosen, dtype=np.int64)
+
+
+def select_best_frames(frame_table, k, min_gap=0, boundaries=None, prefer_reference=False,
+                       reference_weight=DEFAULT_REFERENCE_WEIGHT, column='sharpness'):
+    """column 점수가 높은 프레임 k개를 시간적으로 겹치지 않게 선택 (점수 순서로 반환)
+
+    min_gap    : 선택된 프레임끼리 최소 이만큼(프레임 수) 떨어지도록 억제 (temporal NMS, frames_for_seconds 로 환산)
+    boundaries : 구간(장면) 시작 프레임 배열, 주어지면 구간마다 최대 하나만 선택
+    prefer_reference : 참조/I 프레임 점수에 (1 + reference_weight) 를 곱해서 우대
+
+    구간이 주어지면 구간마다 최고점 하나만 후보로 남긴 뒤, 점수 순 탐욕적 억제로 고름
+    (억제는 막힌 구간 비트맵으로 확인하므로 후보가 많아도 고를 때마다 전체를 비교하지 않음)
+    """
+    values = frame_table.column(column)
+    candidates = np.flatnonzero(~np.isnan(values))
+    if k <= 0 or len(candidates) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    scores = values[candidates]
+    if prefer_reference:
+        scores = scores * (1.0 + reference_weight * frame_table.is_reference[candidates])
+
+    if boundaries is not None and len(boundaries):
+        segments = np.searchsorted(np.asarray(boundaries, dtype=np.int64), candidates, side='right')
+        candidates, scores = _best_per_bucket(candidates, scores, segments)
+
+    if min_gap > 1:
+        return _greedy_nms(candidates, scores, k, min_gap, len(values))
+
+    order = np.lexsort((candidates, -scores))[:k]
+    return candidates[order]
@@ -0,0 +1,103 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def _open_block(name):
+    """이미 만들어진 공유 메모리 블록 열기
+
+    Python 3.13 부터는 track=False 로 열어서, 작업 프로세스가 끝날 때 resource_tracker 가
+    부모가 아직 쓰는 블록을 지워버리지 않도록 함 (만든 쪽인 부모만 정리)
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedColumns:
+    """프레임 번호로 인덱싱되는 지표 열들을 공유 메모리에 둔 묶음
+
+    부모 프로세스가 create() 로 만들고 spec() 을 작업 프로세스에 넘기면, 작업 프로세스는
+    attach() 로 같은 메모리를 열어 계산한 값을 프레임 위치에 바로 씀. 결과를 pickle 로
+    돌려보내 부모에서 다시 기록할 필요가 없고, 부모(GUI) 는 분석 중에도 배열을 그대로 읽을 수 있음
+    """
+
+    def __init__(self, length, blocks, owner):
+        self.length = length
+        # 열 이름 -> (SharedMemory, dtype)
+        self.blocks = blocks
+        self.owner = owner
+        self.arrays = {name: np.ndarray((length,), dtype=dtype, buffer=block.buf)
+                       for name, (block, dtype) in blocks.items()}
+
+    @classmethod
+    def create(cls, length, dtypes):
+        """dtypes (열 이름 -> dtype) 대로 길이 length 배열을 만들고 미분석 값(NaN, 정수는 0)으로 채움"""
+        blocks = {}
+        try:
+            for name, dtype in dtypes.items():
+                dtype = np.dtype(dtype)
+                block = shared_memory.SharedMemory(create=True, size=max(1, length * dtype.itemsize))
+                blocks[name] = (block, dtype)
+        except BaseException:
+            for block, _ in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+
+        columns = cls(length, blocks, owner=True)
+        for array in columns.arrays.values():
+            array.fill(np.nan if array.dtype.kind == 'f' else 0)
+        return columns
+
+    @classmethod
+    def attach(cls, spec):
+        """spec() 으로 받은 정보로 작업 프로세스에서 같은 배열 열기"""
+        blocks = {name: (_open_block(block_name), np.dtype(dtype))
+                  for name, (block_name, dtype) in spec['columns'].items()}
+        return cls(spec['length'], blocks, owner=False)
+
+    def spec(self):
+        """작업 프로세스로 넘길 pickle 가능한 정보 (블록 이름과 자료형)"""
+        return {
+            'length': self.length,
+            'columns': {name: (block.name, dtype.str) for name, (block, dtype) in self.blocks.items()},
+        }
+
+    def __contains__(self, name):
+        return name in self.arrays
+
+    def write(self, frame_indices, values_by_column):
+        """여러 열을 frame_indices 위치에 기록
+
+        분석 여부는 sharpness 가 NaN 인지로 판단하므로, 읽는 쪽이 다른 열이 비어 있는
+        프레임을 분석된 것으로 보지 않도록 sharpness 를 마지막에 씀
+        """
+        frame_indices = np.asarray(frame_indices, dtype=np.int64)
+        for name in sorted(values_by_column, key=lambda column: column == 'sharpness'):
+            array = self.arrays.get(name)
+            if array is not None:
+                array[frame_indices] = values_by_column[name]
+
+    def copy_arrays(self):
+        """공유 메모리를 닫은 뒤에도 쓸 수 있는 일반 배열 사본"""
+        return {name: array.copy() for name, array in self.arrays.items()}
+
+    def close(self):
+        """이 프로세스의 매핑 해제 (만든 쪽이면 블록도 삭제)
+
+        다른 곳에서 아직 배열을 참조하고 있으면 매핑은 그 배열이 사라질 때 해제됨
+        """
+        self.arrays = {}
+        for block, _ in self.blocks.values():
+            if self.owner:
+                try:
+                    block.unlink()
+                except FileNotFoundError:
+                    pass
+            try:
+                block.close()
+            except BufferError:
+                pass
+        self.blocks = {}
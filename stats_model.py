@@ -0,0 +1,87 @@
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+
+class StatsSection:
+    """통계 목록의 한 구간: 제목 한 줄(text) 또는 프레임 인덱스 배열(indices)"""
+    __slots__ = ('text', 'font', 'indices', 'formatter')
+
+    def __init__(self, text=None, font=None, indices=None, formatter=None):
+        self.text = text
+        self.font = font
+        self.indices = indices
+        self.formatter = formatter
+
+    def __len__(self):
+        return 1 if self.indices is None else len(self.indices)
+
+
+def text_section(text, font=None):
+    """선택할 수 없는 제목/구분선 한 줄"""
+    return StatsSection(text=text, font=font)
+
+
+def frame_section(indices, formatter):
+    """formatter(rank, frame_index) 로 표시되는 프레임 행들 (rank 는 1부터)"""
+    return StatsSection(indices=np.asarray(indices, dtype=np.int64), formatter=formatter)
+
+
+class FrameStatsModel(QAbstractListModel):
+    """분석 배열을 그대로 참조하는 가상화 목록 모델
+
+    행마다 QListWidgetItem 을 만들지 않고, 화면에 보이는 행만
+    data() 가 호출될 때 문자열로 만듦
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sections = []
+        self._offsets = np.zeros(1, dtype=np.int64)
+
+    def set_sections(self, sections):
+        self.beginResetModel()
+        self._sections = sections
+        self._offsets = np.concatenate(([0], np.cumsum([len(s) for s in sections], dtype=np.int64)))
+        self.endResetModel()
+
+    def clear(self):
+        self.set_sections([])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return int(self._offsets[-1])
+
+    def _locate(self, row):
+        pos = int(np.searchsorted(self._offsets, row, side='right')) - 1
+        return self._sections[pos], row - int(self._offsets[pos])
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        section, offset = self._locate(index.row())
+
+        if section.indices is None:
+            if role == Qt.DisplayRole:
+                return section.text
+            if role == Qt.FontRole:
+                return section.font
+            return None
+
+        frame_index = int(section.indices[offset])
+
+        if role == Qt.DisplayRole:
+            return section.formatter(offset + 1, frame_index)
+        if role == Qt.UserRole:
+            return frame_index
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        section, _ = self._locate(index.row())
+        if section.indices is None:
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
@@ -0,0 +1,174 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# 오래 켜 두어도 메모리가 계속 늘지 않도록 보관할 최대 이벤트 수 (오래된 것부터 버림, 누적 시간은 유지)
+MAX_EVENTS = 200000
+
+
+def now_us():
+    """추적 시각 (마이크로초)
+
+    perf_counter 는 리눅스/macOS/윈도우 모두 시스템 전체에서 같은 단조 시계라서
+    워커 프로세스에서 잰 시각도 그대로 한 타임라인에 합칠 수 있음
+    """
+    return time.perf_counter_ns() // 1000
+
+
+class Tracer:
+    """구간(span) 시간 기록기, Chrome 트레이스(chrome://tracing, Perfetto) 형식으로 저장 가능
+
+    span()    : with 블록 하나를 이벤트 하나로 기록 (파일 열기, ffprobe, 풀 시작 등)
+    lap()     : 프레임마다 반복되는 단계는 이벤트 없이 이름별 누적 시간만 기록 (디코딩, 지표 계산 등)
+    꺼져 있으면 (enabled=False) 아무것도 기록하지 않음
+    """
+
+    def __init__(self, enabled=False, max_events=MAX_EVENTS):
+        self.enabled = enabled
+        self.events = deque(maxlen=max_events)
+        # 이름 -> [횟수, 누적 초, 최대 초]
+        self.totals = {}
+        # (pid, tid) -> 스레드 이름
+        self.thread_names = {}
+        self.lock = threading.Lock()
+
+    def _record_total(self, name, seconds, count=1):
+        total = self.totals.get(name)
+        if total is None:
+            self.totals[name] = [count, seconds, seconds]
+        else:
+            total[0] += count
+            total[1] += seconds
+            total[2] = max(total[2], seconds)
+
+    def add(self, name, start_us, duration_us, cat='app', args=None):
+        """현재 스레드에서 start_us 부터 duration_us 동안 실행된 구간 기록"""
+        thread = threading.current_thread()
+        event = {'name': name, 'cat': cat, 'ph': 'X', 'ts': start_us, 'dur': duration_us,
+                 'pid': os.getpid(), 'tid': thread.ident}
+        if args:
+            event['args'] = args
+
+        with self.lock:
+            self.events.append(event)
+            self.thread_names[(event['pid'], event['tid'])] = thread.name
+            self._record_total(name, duration_us / 1e6)
+
+    @contextmanager
+    def span(self, name, cat='app', **args):
+        if not self.enabled:
+            yield
+            return
+
+        start = now_us()
+        try:
+            yield
+        finally:
+            self.add(name, start, now_us() - start, cat, args)
+
+    def lap(self, name, since):
+        """since (perf_counter 값) 부터 지금까지를 name 의 누적 시간에 더하고 지금 시각 반환"""
+        if not self.enabled:
+            return since
+        now = time.perf_counter()
+        with self.lock:
+            self._record_total(name, now - since)
+        return now
+
+    def export(self):
+        """다른 프로세스로 돌려보낼 기록 (merge 로 합침)"""
+        with self.lock:
+            return {
+                'events': list(self.events),
+                'totals': {name: list(total) for name, total in self.totals.items()},
+                'thread_names': [[pid, tid, name] for (pid, tid), name in self.thread_names.items()],
+            }
+
+    def merge(self, exported):
+        """워커 프로세스의 export() 결과를 합침"""
+        if not exported or not self.enabled:
+            return
+
+        with self.lock:
+            self.events.extend(exported['events'])
+            for name, (count, seconds, longest) in exported['totals'].items():
+                total = self.totals.setdefault(name, [0, 0.0, 0.0])
+                total[0] += count
+                total[1] += seconds
+                total[2] = max(total[2], longest)
+            for pid, tid, name in exported['thread_names']:
+                self.thread_names[(pid, tid)] = name
+
+    def clear(self):
+        with self.lock:
+            self.events.clear()
+            self.totals.clear()
+            self.thread_names.clear()
+
+    def summary(self):
+        """[(이름, 횟수, 누적 초, 최대 초)] 누적 시간이 긴 순서"""
+        with self.lock:
+            rows = [(name, count, seconds, longest) for name, (count, seconds, longest) in self.totals.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def print_summary(self):
+        rows = self.summary()
+        if not rows:
+            return
+        print("[INFO] 단계별 시간 (누적, 워커 프로세스 합계 포함)")
+        for name, count, seconds, longest in rows:
+            mean_ms = seconds / count * 1000 if count else 0
+            print(f"  {name:<24} {seconds:9.3f}초  {count:8d}회  평균 {mean_ms:8.3f}ms  최대 {longest * 1000:8.1f}ms")
+
+    def chrome_trace(self):
+        """Chrome 트레이스 JSON (traceEvents + 프로세스/스레드 이름 + 단계별 누적 시간)"""
+        main_pid = os.getpid()
+        with self.lock:
+            events = list(self.events)
+            names = dict(self.thread_names)
+
+        metadata = []
+        for pid in sorted({pid for pid, _ in names}):
+            label = 'main' if pid == main_pid else f'worker {pid}'
+            metadata.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': label}})
+        for (pid, tid), name in names.items():
+            metadata.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}})
+
+        return {
+            'traceEvents': metadata + events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'totals': {name: {'count': count, 'seconds': seconds, 'max_seconds': longest}
+                           for name, count, seconds, longest in self.summary()},
+            },
+        }
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+
+# 프로세스 전역 기록기 (GUI/CLI 에서 켜고, 워커 프로세스는 AnalysisOptions.trace 로 각자 켬)
+TRACER = Tracer()
+
+
+def span(name, cat='app', **args):
+    return TRACER.span(name, cat, **args)
+
+
+def traced(name=None, cat='app'):
+    """함수 전체를 span 으로 기록하는 데코레이터"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with TRACER.span(span_name, cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1 @@
+VERSION = "20260317"
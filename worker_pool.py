@@ -0,0 +1,119 @@
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count
+
+from tracing import span
+
+
+# 작업 프로세스가 시작할 때 미리 import 할 모듈 (첫 작업에서 import 시간을 기다리지 않도록)
+# 분석 작업에 필요한 것만 넣음 (PyQt5, PIL 은 작업 프로세스에서 쓰지 않음)
+WORKER_MODULES = ('numpy', 'cv2', 'analyzer')
+
+
+def available_cpu_count():
+    """현재 프로세스가 실제로 사용할 수 있는 CPU 코어 수"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        # macOS / Windows 에는 sched_getaffinity 가 없음
+        return cpu_count()
+
+
+def worker_context(modules=WORKER_MODULES):
+    """작업 프로세스 시작 방식: forkserver (없으면 spawn)
+
+    fork 는 GUI 의 Qt 이벤트 루프/디코딩 스레드가 도는 프로세스를 복제해서 안전하지 않고, 작업 프로세스가
+    PyQt5 와 프레임 캐시까지 물려받음. forkserver 는 modules 만 미리 import 한 서버 프로세스에서 복제하므로
+    작업 프로세스에는 분석에 필요한 모듈만 올라감 (윈도우/macOS 처럼 forkserver 가 없으면 spawn)
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(list(modules))
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def _init_worker(modules):
+    for name in modules:
+        importlib.import_module(name)
+
+
+def _ping():
+    return os.getpid()
+
+
+class WorkerPool:
+    """여러 비디오 분석에 계속 재사용하는 작업 프로세스 풀
+
+    처음 사용할 때 (또는 warm_up() 으로 미리) 프로세스를 만들고, 작업 프로세스가 죽으면
+    (디코더 충돌 등) BrokenProcessPool 이후 restart() 로 새 풀을 만들어 계속 사용.
+    shutdown() 전까지 프로세스를 유지하므로 비디오마다 프로세스 시작 + import 비용이 들지 않음
+    """
+
+    def __init__(self, processes=0, modules=WORKER_MODULES):
+        self.processes = processes or available_cpu_count()
+        self.modules = modules
+        self.lock = threading.Lock()
+        self.executor = None
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def _get_executor(self):
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("작업 프로세스 풀이 이미 종료됨")
+            if self.executor is None:
+                with span('pool_startup', processes=self.processes):
+                    self.executor = ProcessPoolExecutor(max_workers=self.processes,
+                                                        mp_context=worker_context(self.modules),
+                                                        initializer=_init_worker, initargs=(self.modules,))
+            return self.executor
+
+    def submit(self, func, *args):
+        return self._get_executor().submit(func, *args)
+
+    def warm_up(self, wait=False):
+        """모든 작업 프로세스를 미리 시작 (wait=False 면 백그라운드에서)
+
+        ProcessPoolExecutor 는 작업이 들어올 때 프로세스를 만들므로 빈 작업을 프로세스 수만큼 넣음.
+        이미 시작된 풀이면 아무것도 하지 않음
+        """
+        if self.executor is not None:
+            return
+
+        def start():
+            try:
+                with span('pool_warm_up', processes=self.processes):
+                    executor = self._get_executor()
+                    for future in [executor.submit(_ping) for _ in range(self.processes)]:
+                        future.result()
+            except Exception as e:
+                print(f"[WARN] 작업 프로세스 미리 시작 실패: {e}")
+
+        if wait:
+            start()
+        else:
+            threading.Thread(target=start, daemon=True).start()
+
+    def restart(self):
+        """죽은 작업 프로세스가 있는 풀을 버리고 다음 사용 때 새로 만들도록 함"""
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait=True):
+        """대기 중인 작업은 취소하고, 실행 중인 작업은 (wait=True 면) 끝날 때까지 기다린 뒤 종료"""
+        with self.lock:
+            self.closed = True
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)